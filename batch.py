@@ -0,0 +1,206 @@
+# batch.py
+#
+# Modo por lotes: resuelve muchos tableros en paralelo sin abrir ninguna ventana
+# y escribe una línea JSON por tablero. Un archivo puede contener varios
+# tableros (ver board_parser.iter_boards); cada registro lleva el archivo y el
+# índice del tablero dentro de él.
+#
+#   python batch.py puzzles/ "otros/*.txt" -j 8 --timeout 30 -o resultados.jsonl
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from board import Board
+from board_parser import BoardFormatError, iter_boards
+from sat_solver import solve_sat
+from solution_cache import SolutionCache, solve_cached
+from solver import SearchStats, SolveResult, solve_bounded
+
+
+class PuzzleTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise PuzzleTimeout()
+
+
+def solve_sat_bounded(board, timeout=None):
+    """
+    solve_sat con la interfaz de solver.solve_bounded: devuelve un
+    SolveResult. El motor SAT no comprueba plazos por sí mismo, así que el
+    timeout se aplica con SIGALRM (solo en sistemas POSIX y en el hilo
+    principal del proceso; sin SIGALRM no hay límite).
+    """
+    start = time.perf_counter()
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        paths = solve_sat(board)
+        status = "solved" if paths is not None else "unsolvable"
+    except PuzzleTimeout:
+        paths, status = None, "timeout"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    best = paths or {}
+    filled = board.size if paths is not None else 0
+    return SolveResult(status, paths, best, filled, time.perf_counter() - start, SearchStats())
+
+
+# Motores por nombre: engine(board, timeout=None) -> solver.SolveResult
+ENGINES = {
+    "search": solve_bounded,
+    "sat": solve_sat_bounded,
+}
+
+
+def collect_files(inputs):
+    # Cada entrada puede ser un archivo, un directorio (sus *.txt y *.txt.gz) o un patrón glob
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(sorted(glob.glob(os.path.join(item, "*.txt"))
+                                + glob.glob(os.path.join(item, "*.txt.gz"))))
+        elif os.path.isfile(item):
+            files.append(item)
+        else:
+            files.extend(sorted(glob.glob(item)))
+    return files
+
+
+def solve_board(filename, index, rows, cols, pairs, engine="search", timeout=None, cache=None):
+    """
+    Resuelve el tablero número 'index' (base 0) de 'filename' y devuelve un
+    diccionario serializable con el estado ("solved", "unsolvable",
+    "timeout" o "error"), los caminos (índices base 0, como board.paths) y el
+    tiempo en segundos.
+
+    cache es la ruta de una solution_cache.SolutionCache: si el tablero (en
+    cualquier orientación) ya está guardado no se resuelve y el registro lleva
+    "cached": true; las soluciones nuevas se guardan en ella.
+    """
+    record = {"file": filename, "index": index, "engine": engine}
+    start = time.perf_counter()
+    try:
+        board = Board(rows, cols, pairs)
+        record["rows"], record["cols"] = rows, cols
+        store = SolutionCache(cache) if cache is not None else None
+        try:
+            result = solve_cached(board, store, ENGINES[engine], timeout=timeout)
+        finally:
+            if store is not None:
+                store.close()
+        paths = result.paths
+        if result.cached:
+            record["cached"] = True
+        if result.status == "timeout":
+            record["best_pairs"] = len(result.best)
+        if paths is None:
+            record["status"] = result.status
+        else:
+            record["status"] = "solved"
+            record["paths"] = {str(number): [list(cell) for cell in path]
+                               for number, path in sorted(paths.items())}
+    except Exception as exc:
+        record["status"] = "error"
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["time"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def iter_file_boards(filename):
+    """
+    Genera (índice, filas, columnas, pares) para cada tablero del archivo, o
+    un registro de error (dict) si el archivo no se puede abrir o un tablero
+    está mal formado; tras un error no se sigue leyendo ese archivo.
+    """
+    index = 0
+    try:
+        for rows, cols, pairs in iter_boards(filename):
+            yield index, rows, cols, pairs
+            index += 1
+    except (OSError, BoardFormatError) as exc:
+        yield {"file": filename, "index": index, "status": "error",
+               "error": f"{type(exc).__name__}: {exc}", "time": 0.0}
+
+
+def solve_file(filename, engine="search", timeout=None, cache=None):
+    # Un registro de solve_board por cada tablero del archivo, en orden
+    records = []
+    for item in iter_file_boards(filename):
+        if isinstance(item, dict):
+            records.append(item)
+        else:
+            records.append(solve_board(filename, *item, engine, timeout, cache))
+    return records
+
+
+def run_batch(files, output, workers=None, engine="search", timeout=None, cache=None):
+    """
+    Reparte entre los procesos cada tablero de cada archivo (un archivo puede
+    contener varios) y escribe cada resultado en cuanto termina. Devuelve el
+    recuento por estado.
+    """
+    counts = {}
+
+    def write(record):
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for filename in files:
+            for item in iter_file_boards(filename):
+                if isinstance(item, dict):
+                    write(item)
+                else:
+                    futures.append(pool.submit(solve_board, filename, *item, engine, timeout,
+                                               cache))
+        for future in as_completed(futures):
+            write(future.result())
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve tableros NumberLink por lotes.")
+    parser.add_argument("inputs", nargs="+", help="archivos, directorios o patrones glob")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="segundos máximos por tablero")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="search")
+    parser.add_argument("--cache", metavar="SQLITE", default=None,
+                        help="caché de soluciones compartida (rotaciones y renumeraciones incluidas)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="archivo JSON Lines de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.inputs)
+    if not files:
+        parser.error("no se encontró ningún tablero")
+
+    start = time.perf_counter()
+    if args.output == "-":
+        counts = run_batch(files, sys.stdout, args.workers, args.engine, args.timeout,
+                           args.cache)
+    else:
+        with open(args.output, "w") as output:
+            counts = run_batch(files, output, args.workers, args.engine, args.timeout,
+                               args.cache)
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items()))
+    print(f"{sum(counts.values())} tableros de {len(files)} archivos en {elapsed:.2f} s "
+          f"({summary})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
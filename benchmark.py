@@ -0,0 +1,172 @@
+# benchmark.py
+#
+# Banco de pruebas de rendimiento: genera (con semilla) tableros por niveles de
+# tamaño, los resuelve y guarda un informe JSON comparable entre versiones con
+# tiempo, nodos expandidos, caminos enumerados y memoria máxima por tablero.
+#
+#   python benchmark.py -o base.json
+#   python benchmark.py --baseline base.json --tolerance 0.2   # falla si empeora
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from board import Board
+from generator import generate_puzzle
+from sat_solver import solve_sat
+from solver import SearchStats, solve_bounded
+
+DEFAULT_TIERS = [7, 10, 15, 20, 25, 30]
+
+
+def build_suite(sizes, per_tier=3, seed=0, unique_up_to=10):
+    # Tableros n x n por nivel; solo se exige solución única hasta unique_up_to
+    suite = []
+    for size in sizes:
+        for k in range(per_tier):
+            puzzle_seed = seed * 1000003 + size * 1000 + k
+            rows, cols, pairs, _ = generate_puzzle(size, size, seed=puzzle_seed,
+                                                   unique=size <= unique_up_to)
+            suite.append({"tier": size, "seed": puzzle_seed, "rows": rows, "cols": cols,
+                          "pairs": pairs})
+    return suite
+
+
+def run_puzzle(puzzle, engine="search", timeout=None, track_memory=True):
+    """
+    Resuelve un tablero y devuelve su registro. El límite de tiempo solo se
+    aplica al motor de búsqueda (es su propio plazo); el SAT no es interrumpible.
+    """
+    board = Board(puzzle["rows"], puzzle["cols"], puzzle["pairs"])
+    stats = SearchStats()
+    status = None
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        if engine == "sat":
+            status = "solved" if solve_sat(board) is not None else "unsolvable"
+        else:
+            status = solve_bounded(board, timeout=timeout, stats=stats).status
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+    record = {
+        "tier": puzzle["tier"],
+        "seed": puzzle["seed"],
+        "pairs": len(puzzle["pairs"]),
+        "status": status,
+        "time": round(elapsed, 6),
+        "peak_kb": None if peak is None else round(peak / 1024, 1),
+    }
+    if engine == "search":
+        record.update(nodes=stats.nodes, paths=stats.paths, forced_cells=stats.forced_cells)
+    return record
+
+
+def summarize(records):
+    tiers = {}
+    for record in records:
+        tiers.setdefault(str(record["tier"]), []).append(record)
+    summary = {}
+    for tier, group in tiers.items():
+        times = [r["time"] for r in group]
+        summary[tier] = {
+            "puzzles": len(group),
+            "solved": sum(r["status"] == "solved" for r in group),
+            "median_time": round(statistics.median(times), 6),
+            "total_time": round(sum(times), 6),
+            "nodes": sum(r.get("nodes") or 0 for r in group),
+            "paths": sum(r.get("paths") or 0 for r in group),
+            "max_peak_kb": max((r["peak_kb"] or 0) for r in group),
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance=0.2, min_delta=0.05):
+    """
+    Compara con el resumen de un informe anterior. Devuelve una lista de
+    mensajes, uno por nivel que resuelve menos tableros o tarda más de un
+    (1 + tolerance) del tiempo total de referencia. Las diferencias de menos de
+    min_delta segundos se consideran ruido.
+    """
+    regressions = []
+    for tier, old in baseline.items():
+        new = summary.get(tier)
+        if new is None:
+            continue
+        if new["solved"] < old["solved"]:
+            regressions.append(f"{tier}x{tier}: resueltos {old['solved']} -> {new['solved']}")
+        slower = new["total_time"] - old["total_time"]
+        if slower > min_delta and new["total_time"] > old["total_time"] * (1 + tolerance):
+            ratio = new["total_time"] / old["total_time"]
+            regressions.append(f"{tier}x{tier}: tiempo x{ratio:.2f} "
+                               f"({old['total_time']:.3f} s -> {new['total_time']:.3f} s)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el rendimiento del solucionador.")
+    parser.add_argument("--tiers", default=",".join(map(str, DEFAULT_TIERS)),
+                        help="tamaños n de los tableros n x n, separados por comas")
+    parser.add_argument("--per-tier", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unique-up-to", type=int, default=10,
+                        help="exigir solución única hasta este tamaño")
+    parser.add_argument("--engine", choices=["search", "sat"], default="search")
+    parser.add_argument("--timeout", type=float, default=30.0, help="segundos por tablero")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="no medir memoria (tracemalloc ralentiza la búsqueda)")
+    parser.add_argument("-o", "--output", default=None, help="informe JSON de salida")
+    parser.add_argument("--baseline", default=None, help="informe anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.tiers.split(",")]
+    suite = build_suite(sizes, args.per_tier, args.seed, args.unique_up_to)
+    records = []
+    for puzzle in suite:
+        record = run_puzzle(puzzle, args.engine, args.timeout, not args.no_memory)
+        records.append(record)
+        print(f"{record['tier']:>3}x{record['tier']:<3} semilla {record['seed']}: "
+              f"{record['status']:<8} {record['time']:8.3f} s", file=sys.stderr)
+
+    summary = summarize(records)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "engine": args.engine,
+            "timeout": args.timeout,
+            "seed": args.seed,
+            "per_tier": args.per_tier,
+            "memory": not args.no_memory,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "tiers": summary,
+        "puzzles": records,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    for tier, row in summary.items():
+        print(f"{tier}x{tier}: {row['solved']}/{row['puzzles']} resueltos, "
+              f"{row['total_time']:.3f} s, {row['nodes']} nodos, {row['paths']} caminos, "
+              f"{row['max_peak_kb']} KB")
+
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)["tiers"]
+        regressions = compare(summary, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESIÓN {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
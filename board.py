@@ -6,12 +6,113 @@ class Board:
         self.cols = cols
         self.pairs = pairs  # {number: [(r1, c1), (r2, c2)]}
         self.grid = [[None for _ in range(cols)] for _ in range(rows)]
-        self.paths = {}  # {number: [(r, c), (r, c), ...]}
+        # {number: [(r, c), (r, c), ...]}; solo se modifica con los métodos de
+        # Board (add_to_path, set_path...) para mantener el índice de ocupación
+        self.paths = {}
 
         for number, positions in pairs.items():
             for r, c in positions:
                 self.grid[r][c] = number
 
+        # Representación por bits: la celda (r, c) es el índice r * cols + c y
+        # un conjunto de celdas es un entero con esos bits activos.
+        self.size = rows * cols
+        self.full_mask = (1 << self.size) - 1
+        self.endpoint_mask = 0
+        for positions in pairs.values():
+            self.endpoint_mask |= self.mask_of(positions)
+
+        # Máscaras para desplazar sin "saltar" de una fila a la siguiente
+        first_col = 0
+        for r in range(rows):
+            first_col |= 1 << (r * cols)
+        self._not_first_col = self.full_mask & ~first_col
+        self._not_last_col = self.full_mask & ~(first_col << (cols - 1))
+
+        self.neighbors = []  # índice -> lista de índices vecinos
+        self.neighbor_masks = []  # índice -> máscara de vecinos
+        for r in range(rows):
+            for c in range(cols):
+                neighs = []
+                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        neighs.append(nr * cols + nc)
+                self.neighbors.append(neighs)
+                mask = 0
+                for i in neighs:
+                    mask |= 1 << i
+                self.neighbor_masks.append(mask)
+
+        # Índice de ocupación: número cuyo camino pasa por cada celda (o None),
+        # y cuántas celdas están cubiertas por un camino o por un número fijo
+        self._owner = [None] * self.size
+        self._endpoint_count = bin(self.endpoint_mask).count("1")
+        self.filled = self._endpoint_count
+
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def bit(self, r, c):
+        return 1 << (r * self.cols + c)
+
+    def mask_of(self, cells):
+        mask = 0
+        cols = self.cols
+        for r, c in cells:
+            mask |= 1 << (r * cols + c)
+        return mask
+
+    def cells_of(self, mask):
+        # Recorre los bits activos de menor a mayor índice
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(divmod(low.bit_length() - 1, self.cols))
+            mask ^= low
+        return cells
+
+    def free_mask(self, occupied):
+        # Celdas sin número fijo que no están en 'occupied'
+        return self.full_mask & ~occupied & ~self.endpoint_mask
+
+    def neighbor_planes(self, mask):
+        # Por separado: celdas cuyo vecino de la izquierda, derecha, arriba y
+        # abajo está en 'mask'
+        cols = self.cols
+        return ((mask << 1) & self._not_first_col,
+                (mask >> 1) & self._not_last_col,
+                (mask << cols) & self.full_mask,
+                mask >> cols)
+
+    def expand(self, mask):
+        # Vecinos ortogonales de todas las celdas de 'mask', en bloque
+        cols = self.cols
+        return ((mask << 1) & self._not_first_col
+                | (mask >> 1) & self._not_last_col
+                | (mask << cols) & self.full_mask
+                | mask >> cols)
+
+    def owner(self, r, c):
+        # Número del camino que pasa por (r, c), o None
+        return self._owner[r * self.cols + c]
+
+    def _claim(self, number, position):
+        i = position[0] * self.cols + position[1]
+        if self._owner[i] is None and not self.endpoint_mask >> i & 1:
+            self.filled += 1
+        self._owner[i] = number
+
+    def _unclaim(self, number, position):
+        i = position[0] * self.cols + position[1]
+        if self._owner[i] == number:
+            self._owner[i] = None
+            if not self.endpoint_mask >> i & 1:
+                self.filled -= 1
+
     def is_valid_move(self, r, c,r1,c1, current_number):
         if not (0 <= r < self.rows and 0 <= c < self.cols):
             return False
@@ -19,44 +120,50 @@ class Board:
             return False
         if not((abs(r - r1) == 1 and c == c1) or (abs(c - c1) == 1 and r == r1)):
             return False
-        for path in self.paths.values():
-            if (r, c) in path:
-                return False
-        return True
+        return self._owner[r * self.cols + c] is None
 
     def add_to_path(self, number, position):
         if number not in self.paths:
             self.paths[number] = []
         self.paths[number].append(position)
+        self._claim(number, position)
 
     def remove_last_from_path(self, number):
         if number in self.paths and self.paths[number]:
-            self.paths[number].pop()
+            self._unclaim(number, self.paths[number].pop())
+
+    def set_path(self, number, path):
+        # Sustituye el camino del número por 'path' (se guarda tal cual, sin copiar)
+        self.remove_path(number)
+        self.paths[number] = path
+        for position in path:
+            self._claim(number, position)
+
+    def remove_path(self, number):
+        for position in self.paths.pop(number, ()):
+            self._unclaim(number, position)
+
+    def set_paths(self, paths):
+        # Sustituye todos los caminos por los de 'paths' ({número: camino})
+        self.clear_paths()
+        for number, path in paths.items():
+            self.set_path(number, list(path))
+
+    def clear_paths(self):
+        self.paths.clear()
+        self._owner = [None] * self.size
+        self.filled = self._endpoint_count
+
 def is_game_completed(board):
     # Verifica que todos los pares estén conectados correctamente
     for number, positions in board.pairs.items():
-        if number not in board.paths:
+        path = board.paths.get(number)
+        if not path:
             return False
-        path = board.paths[number]
-        if not (positions[0] in path and positions[1] in path):
+        if board.owner(*positions[0]) != number or board.owner(*positions[1]) != number:
             return False
         if path[0] not in positions or path[-1] not in positions:
             return False
 
-    # Verifica que todas las celdas estén ocupadas
-    used_cells = set()
-    for path in board.paths.values():
-        for cell in path:
-            used_cells.add(cell)
-
-    # También contar las celdas que ya tienen un número fijo
-    for number, positions in board.pairs.items():
-        used_cells.update(positions)
-
-    total_cells = board.rows * board.cols
-    if len(used_cells) < total_cells:
-        return False
-
-    return True
-
-    
\ No newline at end of file
+    # Verifica que todas las celdas estén ocupadas (por un camino o un número fijo)
+    return board.filled == board.size
@@ -1,18 +1,111 @@
 # board_parser.py
+#
+# Formato de texto: una línea "filas,columnas" y después una línea
+# "fila,columna,número" por extremo, con coordenadas base 1. Un archivo puede
+# contener varios tableros seguidos: cada línea de dos campos empieza uno
+# nuevo. Se ignoran las líneas vacías y las que empiezan por '#'. Los archivos
+# terminados en .gz se descomprimen al vuelo.
+import gzip
+
+
+class BoardFormatError(ValueError):
+    pass
+
+
+def _open_text(source):
+    if hasattr(source, "read"):
+        return source, False
+    if str(source).endswith(".gz"):
+        return gzip.open(source, "rt"), True
+    return open(source, "r"), True
+
+
+def _check_pairs(pairs, header_line, name):
+    for number, positions in pairs.items():
+        if len(positions) != 2:
+            raise BoardFormatError(f"{name}:{header_line}: el número {number} tiene "
+                                   f"{len(positions)} extremo(s), se esperaban 2")
+
+
+def iter_boards(source):
+    """
+    Genera (filas, columnas, pares) para cada tablero de 'source' (nombre de
+    archivo u objeto de texto abierto), leyendo línea a línea. Los pares son
+    {número: [(r1, c1), (r2, c2)]} con coordenadas base 0.
+
+    Valida a la vez que lee: tamaño positivo, coordenadas dentro del tablero,
+    una sola marca por celda y exactamente dos extremos por número. Ante un
+    error lanza BoardFormatError indicando el archivo y la línea.
+    """
+    file, owned = _open_text(source)
+    name = getattr(file, "name", "<stream>")
+    try:
+        rows = cols = None
+        pairs = seen = None
+        header_line = 0
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                fields = [int(field) for field in line.split(",")]
+            except ValueError:
+                raise BoardFormatError(f"{name}:{line_number}: línea no válida: {line!r}") from None
+
+            if len(fields) == 2:
+                if pairs is not None:
+                    _check_pairs(pairs, header_line, name)
+                    yield rows, cols, pairs
+                rows, cols = fields
+                if rows <= 0 or cols <= 0:
+                    raise BoardFormatError(f"{name}:{line_number}: tamaño no válido {rows}x{cols}")
+                pairs = {}
+                seen = set()
+                header_line = line_number
+            elif len(fields) == 3:
+                if pairs is None:
+                    raise BoardFormatError(f"{name}:{line_number}: falta la línea de tamaño")
+                row, col, number = fields
+                if not (1 <= row <= rows and 1 <= col <= cols):
+                    raise BoardFormatError(f"{name}:{line_number}: ({row},{col}) fuera del "
+                                           f"tablero {rows}x{cols}")
+                cell = (row - 1, col - 1)  # Convertimos a índice base 0
+                if cell in seen:
+                    raise BoardFormatError(f"{name}:{line_number}: celda ({row},{col}) repetida")
+                seen.add(cell)
+                pairs.setdefault(number, []).append(cell)
+            else:
+                raise BoardFormatError(f"{name}:{line_number}: se esperaban 2 o 3 campos: {line!r}")
+
+        if pairs is not None:
+            _check_pairs(pairs, header_line, name)
+            yield rows, cols, pairs
+    finally:
+        if owned:
+            file.close()
+
 
 def read_board_file(filename):
-    with open(filename, "r") as file:
-        lines = file.readlines()
+    # Primer (normalmente único) tablero del archivo
+    boards = iter_boards(filename)
+    try:
+        board = next(boards, None)
+    finally:
+        boards.close()
+    if board is None:
+        raise BoardFormatError(f"{filename}: no contiene ningún tablero")
+    return board
+
 
-    # Obtener tamaño del tablero
-    n_rows, n_cols = map(int, lines[0].strip().split(','))
+def format_board(rows, cols, pairs):
+    # Texto en el mismo formato que lee read_board_file (coordenadas base 1)
+    lines = [f"{rows},{cols}"]
+    for number, positions in sorted(pairs.items()):
+        for r, c in positions:
+            lines.append(f"{r + 1},{c + 1},{number}")
+    return "\n".join(lines) + "\n"
 
-    # Leer las coordenadas de los números
-    pairs = {}
-    for line in lines[1:]:
-        row, col, number = map(int, line.strip().split(','))
-        if number not in pairs:
-            pairs[number] = []
-        pairs[number].append((row - 1, col - 1))  # Convertimos a índice base 0
 
-    return n_rows, n_cols, pairs
\ No newline at end of file
+def write_board_file(filename, rows, cols, pairs):
+    with open(filename, "w") as file:
+        file.write(format_board(rows, cols, pairs))
@@ -0,0 +1,269 @@
+# cdcl.py
+#
+# Resolutor SAT CDCL en Python puro (vigilancia de dos literales, aprendizaje
+# 1-UIP, actividad VSIDS, guardado de fase y reinicios Luby). Las cláusulas usan
+# la convención DIMACS: la variable v es el literal v y su negación es -v.
+import heapq
+import os
+import shutil
+import subprocess
+import tempfile
+
+
+def _luby(i):
+    # Elemento i (desde 1) de la secuencia de Luby: 1 1 2 1 1 2 4 ...
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class CDCLSolver:
+    """
+    Internamente cada literal se codifica como 2 * v (positivo) o 2 * v + 1
+    (negado), de modo que la negación es código ^ 1 y la variable código >> 1.
+    """
+
+    def __init__(self, num_vars):
+        self.num_vars = num_vars
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * num_vars + 2)]
+        self.values = [0] * (2 * num_vars + 2)  # por literal: 1 cierto, -1 falso, 0 libre
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.phase = [1] * (num_vars + 1)  # 1: probar primero el literal negado
+        self.order = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.unsat = False
+        self.conflicts = 0
+
+    @staticmethod
+    def _code(lit):
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def add_clause(self, lits):
+        # Se puede llamar entre dos solve(): se vuelve primero al nivel 0
+        if self.trail_lim:
+            self._backtrack(0)
+        codes = []
+        for lit in lits:
+            code = self._code(lit)
+            if code ^ 1 in codes:
+                return  # tautología
+            if code not in codes:
+                codes.append(code)
+        # Quita literales ya falsos en el nivel 0
+        if any(self.values[c] == 1 for c in codes):
+            return
+        codes = [c for c in codes if self.values[c] == 0]
+        if not codes:
+            self.unsat = True
+        elif len(codes) == 1:
+            self._enqueue(codes[0], None)
+            if self._propagate() is not None:
+                self.unsat = True
+        else:
+            self._attach(codes)
+
+    def _attach(self, clause):
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _enqueue(self, code, reason):
+        var = code >> 1
+        self.values[code] = 1
+        self.values[code ^ 1] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(code)
+
+    def _propagate(self):
+        values = self.values
+        watches = self.watches
+        while self.qhead < len(self.trail):
+            false_code = self.trail[self.qhead] ^ 1
+            self.qhead += 1
+            watching = watches[false_code]
+            kept = []
+            for pos, clause in enumerate(watching):
+                if clause[0] == false_code:
+                    clause[0], clause[1] = clause[1], false_code
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    if values[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], false_code
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == -1:
+                        kept.extend(watching[pos + 1:])
+                        watches[false_code] = kept
+                        return clause
+                    self._enqueue(first, clause)
+            watches[false_code] = kept
+        return None
+
+    def _analyze(self, conflict):
+        seen = set()
+        learnt = [0]
+        current = len(self.trail_lim)
+        counter = 0
+        code = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                if q == code:
+                    continue
+                var = q >> 1
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.level[var] == current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while self.trail[index] >> 1 not in seen:
+                index -= 1
+            code = self.trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reason[code >> 1]
+        learnt[0] = code ^ 1
+
+        back_level = 0
+        if len(learnt) > 1:
+            # El literal del nivel más alto pasa a la segunda posición vigilada
+            best = max(range(1, len(learnt)), key=lambda k: self.level[learnt[k] >> 1])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            back_level = self.level[learnt[1] >> 1]
+        return learnt, back_level
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                self.activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1)]
+            heapq.heapify(self.order)
+        else:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def _backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for code in self.trail[start:]:
+            var = code >> 1
+            self.values[code] = 0
+            self.values[code ^ 1] = 0
+            self.reason[var] = None
+            self.phase[var] = code & 1
+            heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = start
+
+    def _pick(self):
+        while self.order:
+            _, var = heapq.heappop(self.order)
+            if self.values[2 * var] == 0:
+                return var
+        return None
+
+    def solve(self, max_conflicts=None):
+        """
+        Devuelve un modelo como lista de bool indexada por variable (la posición
+        0 no se usa), None si la fórmula es insatisfacible, o False si se agota
+        max_conflicts sin respuesta.
+        """
+        if self.unsat:
+            return None
+        if self._propagate() is not None:
+            self.unsat = True
+            return None
+        restart = 1
+        budget = 100 * _luby(restart)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.unsat = True
+                    return None
+                learnt, back_level = self._analyze(conflict)
+                self._backtrack(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= 0.95
+                budget -= 1
+                if max_conflicts is not None and self.conflicts >= max_conflicts:
+                    self._backtrack(0)
+                    return False
+                if budget <= 0:
+                    restart += 1
+                    budget = 100 * _luby(restart)
+                    self._backtrack(0)
+            else:
+                var = self._pick()
+                if var is None:
+                    return [False] + [self.values[2 * v] == 1 for v in range(1, self.num_vars + 1)]
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(2 * var + self.phase[var], None)
+
+
+def write_dimacs(stream, num_vars, clauses):
+    stream.write(f"p cnf {num_vars} {len(clauses)}\n")
+    for clause in clauses:
+        stream.write(" ".join(map(str, clause)) + " 0\n")
+
+
+def minisat_path():
+    # Ruta de un binario minisat instalado, o None
+    return shutil.which("minisat")
+
+
+def solve_with_minisat(num_vars, clauses, binary=None):
+    """Resuelve con un minisat externo; mismo formato de retorno que CDCLSolver.solve."""
+    binary = binary or minisat_path()
+    fd_in, cnf_name = tempfile.mkstemp(suffix=".cnf")
+    fd_out, out_name = tempfile.mkstemp(suffix=".out")
+    os.close(fd_out)
+    try:
+        with os.fdopen(fd_in, "w") as stream:
+            write_dimacs(stream, num_vars, clauses)
+        subprocess.run([binary, "-verb=0", cnf_name, out_name],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(out_name) as stream:
+            tokens = stream.read().split()
+    finally:
+        os.unlink(cnf_name)
+        os.unlink(out_name)
+    if not tokens or tokens[0] != "SAT":
+        return None
+    model = [False] * (num_vars + 1)
+    for token in tokens[1:]:
+        lit = int(token)
+        if lit > 0:
+            model[lit] = True
+    return model
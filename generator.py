@@ -0,0 +1,159 @@
+# generator.py
+#
+# Generador de tableros aleatorios con semilla: se construye un camino que
+# recorre todo el tablero (hamiltoniano), se baraja con movimientos "backbite"
+# y se corta en tramos que no se tocan a sí mismos; los extremos de cada tramo
+# son los números del tablero. Así el tablero siempre tiene solución, y opcionalmente
+# se comprueba que sea única (contando soluciones con la búsqueda, o con SAT).
+#
+#   python generator.py 10 10 12 --seed 7 -o tablero.txt
+import argparse
+import random
+
+from board import Board
+from board_parser import format_board, write_board_file
+from sat_solver import solve_sat
+from solver import count_solutions
+
+
+def random_hamiltonian_path(rows, cols, rnd, moves=None):
+    """
+    Camino que pasa una vez por cada celda. Parte de una serpiente por filas y
+    aplica 'moves' movimientos backbite (por defecto, 10 por celda): se une un
+    extremo con un vecino suyo del camino y se invierte el tramo sobrante.
+    """
+    path = [(r, c if r % 2 == 0 else cols - 1 - c) for r in range(rows) for c in range(cols)]
+    if moves is None:
+        moves = 10 * rows * cols
+    position = {cell: i for i, cell in enumerate(path)}
+    for _ in range(moves):
+        if rnd.random() < 0.5:
+            path.reverse()
+            position = {cell: i for i, cell in enumerate(path)}
+        r, c = path[-1]
+        neighbors = [(r + dr, c + dc) for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]]
+        neighbors = [cell for cell in neighbors
+                     if cell in position and position[cell] != len(path) - 2]
+        if not neighbors:
+            continue
+        i = position[rnd.choice(neighbors)]
+        path[i + 1:] = path[:i:-1]
+        for k in range(i + 1, len(path)):
+            position[path[k]] = k
+    return path
+
+
+def _touches(cell, cells):
+    r, c = cell
+    return any(abs(r - r2) + abs(c - c2) == 1 for r2, c2 in cells)
+
+
+def _touches_itself(segment):
+    # ¿Alguna celda es vecina de otra del tramo que no sea la anterior o la siguiente?
+    return any(_touches(cell, segment[:i - 1]) for i, cell in enumerate(segment) if i >= 2)
+
+
+def split_path(path, n_pairs, rnd, min_length=2):
+    """
+    Corta el camino en tramos que no se tocan a sí mismos: una celda nunca es
+    vecina de otra de su tramo salvo de la anterior y la siguiente. Los caminos
+    que se tocan (o rellenan bloques 2x2) casi siempre admiten otra solución.
+    Si el último tramo queda corto, el corte anterior se retrasa pasándole
+    celdas del penúltimo; si así no se puede, devuelve None (hay que probar
+    otro camino). Si hacen falta menos de n_pairs tramos se cortan al azar los
+    más largos; si hacen falta más devuelve None. Con n_pairs=None se quedan
+    los mínimos.
+    """
+    segments = [[path[0]]]
+    for cell in path[1:]:
+        segment = segments[-1]
+        if len(segment) >= min_length and _touches(cell, segment[:-1]):
+            segments.append([cell])
+        else:
+            segment.append(cell)
+    if len(segments) > 1 and len(segments[-1]) < min_length:
+        # Unir el final al tramo anterior lo haría tocarse justo donde se cortó
+        previous, tail = segments[-2], segments[-1]
+        shift = min_length - len(tail)
+        if len(previous) - shift < min_length:
+            return None
+        tail[:0] = previous[-shift:]
+        del previous[-shift:]
+        if _touches_itself(tail):
+            return None
+
+    if n_pairs is None:
+        return segments
+    if len(segments) > n_pairs:
+        return None
+    while len(segments) < n_pairs:
+        splittable = [s for s in segments if len(s) >= 2 * min_length]
+        if not splittable:
+            return None
+        segment = rnd.choice(splittable)
+        i = segments.index(segment)
+        cut = rnd.randint(min_length, len(segment) - min_length)
+        segments[i:i + 1] = [segment[:cut], segment[cut:]]
+    return segments
+
+
+def _is_unique(board, solution, checker, backend):
+    if checker == "sat":
+        return solve_sat(board, backend, exclude=[solution]) is None
+    return count_solutions(board, limit=2) == 1
+
+
+def generate_puzzle(rows, cols, n_pairs=None, seed=None, unique=True, max_attempts=200,
+                    min_length=2, checker="search", backend="auto"):
+    """
+    Devuelve (rows, cols, pairs, solution) con pairs en el formato de
+    board_parser.read_board_file ({número: [(r1, c1), (r2, c2)]}) y solution
+    como {número: camino}. n_pairs=None deja el número de pares que salga del
+    corte (del orden de rows * cols / 6).
+
+    Con unique=True se descartan los tableros con más de una solución. checker
+    elige cómo se comprueba: "search" cuenta soluciones hasta 2 con
+    solver.count_solutions; "sat" pide al motor SAT (con 'backend') una
+    solución distinta de la conocida. Si tras max_attempts intentos no sale
+    ninguno válido se lanza RuntimeError.
+    """
+    rnd = random.Random(seed)
+    for _ in range(max_attempts):
+        path = random_hamiltonian_path(rows, cols, rnd)
+        segments = split_path(path, n_pairs, rnd, min_length)
+        if segments is None:
+            continue
+        pairs = {}
+        solution = {}
+        for number, segment in enumerate(segments, start=1):
+            pairs[number] = [segment[0], segment[-1]]
+            solution[number] = segment
+        if not unique or _is_unique(Board(rows, cols, pairs), solution, checker, backend):
+            return rows, cols, pairs, solution
+    raise RuntimeError(f"ningún tablero {rows}x{cols} válido tras {max_attempts} intentos")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un tablero NumberLink aleatorio.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("pairs", type=int, nargs="?", default=None,
+                        help="número de pares (por defecto, el que salga del corte)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--any", action="store_true",
+                        help="no exigir solución única (mucho más rápido en tableros grandes)")
+    parser.add_argument("--checker", choices=["search", "sat"], default="search",
+                        help="cómo comprobar que la solución es única")
+    parser.add_argument("-o", "--output", default=None, help="archivo de salida")
+    args = parser.parse_args(argv)
+
+    rows, cols, pairs, _ = generate_puzzle(args.rows, args.cols, args.pairs, args.seed,
+                                           unique=not args.any, checker=args.checker)
+    if args.output:
+        write_board_file(args.output, rows, cols, pairs)
+    else:
+        print(format_board(rows, cols, pairs), end="")
+
+
+if __name__ == "__main__":
+    main()
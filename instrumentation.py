@@ -0,0 +1,112 @@
+# instrumentation.py
+#
+# Trazas de la búsqueda para averiguar por qué un tablero es lento: contadores
+# con nombre, histogramas por profundidad, caminos probados por par y tiempo
+# acumulado por fase (enumerar caminos, propagar, podar, dibujar). El solver
+# solo las rellena si se le pasa un Tracer; sin él no hay ningún coste.
+#
+# También hay un envoltorio de cProfile para perfilar cualquier llamada.
+import cProfile
+import io
+import json
+import pstats
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Acumula lo que la búsqueda le notifica. Las profundidades son el número de
+    caminos colocados (0 = raíz). Se puede reutilizar entre búsquedas para
+    sumar varias, o llamar a reset().
+    """
+
+    DEPTH_EVENTS = ("nodes", "paths", "pruned", "backtracks")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counters = Counter()  # eventos sueltos: "dead_end", "stranded", ...
+        self.depth = {name: Counter() for name in self.DEPTH_EVENTS}
+        self.pair_paths = Counter()  # número -> caminos probados para ese par
+        self.phase_time = defaultdict(float)
+        self.phase_calls = Counter()
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def at_depth(self, name, depth, amount=1):
+        self.depth[name][depth] += amount
+
+    def add_time(self, phase, seconds):
+        self.phase_time[phase] += seconds
+        self.phase_calls[phase] += 1
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, phase, iterable):
+        # Itera 'iterable' sumando a 'phase' el tiempo de cada next()
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(phase, perf_counter() - start)
+                return
+            self.add_time(phase, perf_counter() - start)
+            yield item
+
+    def as_dict(self, stats=None):
+        """
+        Diccionario serializable en JSON. Los histogramas son listas indexadas
+        por profundidad. Si se pasa el SearchStats de la misma búsqueda, sus
+        contadores se incluyen en "stats".
+        """
+        max_depth = max((max(hist) for hist in self.depth.values() if hist), default=-1)
+        data = {
+            "counters": dict(self.counters),
+            "depth": {name: [hist[d] for d in range(max_depth + 1)]
+                      for name, hist in self.depth.items()},
+            "pairs": {str(number): count for number, count in sorted(self.pair_paths.items())},
+            "phases": {name: {"seconds": round(seconds, 6), "calls": self.phase_calls[name]}
+                       for name, seconds in sorted(self.phase_time.items())},
+        }
+        if stats is not None:
+            data["stats"] = stats.as_dict()
+        return data
+
+    def dump_json(self, filename, stats=None):
+        with open(filename, "w") as output:
+            json.dump(self.as_dict(stats), output, indent=2)
+
+    def summary(self):
+        # Resumen de una línea por fase, de la más a la menos costosa
+        lines = []
+        for name, seconds in sorted(self.phase_time.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<10} {seconds:9.4f} s  {self.phase_calls[name]:>8} llamadas")
+        return "\n".join(lines)
+
+
+def profile_call(func, *args, output=None, sort="cumulative", limit=25, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) bajo cProfile. Devuelve (resultado, informe)
+    con las 'limit' primeras funciones ordenadas por 'sort'. Si se indica
+    output, guarda también las estadísticas en bruto (para snakeviz, pstats...).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    if output is not None:
+        profiler.dump_stats(output)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+    return result, stream.getvalue()
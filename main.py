@@ -1,13 +1,17 @@
 # main.py
-import heapq
-
-import pygame
+#
+# pygame solo se importa en las funciones de la interfaz: el resto del módulo
+# (y lo que reexporta del solucionador) se puede importar sin pygame ni SDL.
+import argparse
 import sys
 import time
-from collections import deque
 from board_parser import read_board_file
 from board import Board, is_game_completed
-from ui import draw_board, CELL_SIZE, MARGIN, FONT_SIZE
+from solver import has_dead_end, a_star_all_paths  # reexportadas para las pruebas
+from instrumentation import Tracer
+from runner import SearchRunner
+from solution_cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, SolutionCache
+from ui import BoardRenderer, CELL_SIZE, MARGIN, FONT_SIZE
 
 def get_cell_from_mouse(pos):
     x, y = pos
@@ -16,6 +20,8 @@ def get_cell_from_mouse(pos):
     return row, col
 
 def show_menu(screen, font):
+    import pygame
+
     options = ["Jugar manualmente", "Resolver automáticamente"]
     selected = 0
 
@@ -44,6 +50,8 @@ def show_menu(screen, font):
                     return selected  # 0: manual, 1: automático
 
 def run_manual_game(screen, board, font, rows, cols):
+    import pygame
+
     running = True
     dragging = False
     current_number = None
@@ -52,18 +60,31 @@ def run_manual_game(screen, board, font, rows, cols):
 
     start_time = time.time()
     clock = pygame.time.Clock()  # Para controlar FPS
+    renderer = BoardRenderer(board, font)
+    timer_label = None
+    timer_rect = None
 
     while running:
         elapsed_time = int(time.time() - start_time)
-        draw_board(screen, board, font)
 
         # Mostrar temporizador
         minutes = elapsed_time // 60
         seconds = elapsed_time % 60
-        timer_text = font.render(f"Tiempo: {minutes:02d}:{seconds:02d}", True, (0, 0, 255))
-        screen.blit(timer_text, (10, 10))
-
-        pygame.display.flip()
+        label = f"Tiempo: {minutes:02d}:{seconds:02d}"
+        if label != timer_label and timer_rect is not None:
+            renderer.invalidate_rect(timer_rect)
+
+        # Solo se repintan las celdas que cambian; el texto se vuelve a poner
+        # encima si cambia o si alguna celda repintada lo tapa
+        rects = renderer.draw(screen)
+        if label != timer_label or timer_rect.collidelist(rects) != -1:
+            timer_label = label
+            timer_text = font.render(label, True, (0, 0, 255))
+            timer_rect = screen.blit(timer_text, (10, 10))
+            rects.append(timer_rect)
+
+        if rects:
+            pygame.display.update(rects)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -76,7 +97,7 @@ def run_manual_game(screen, board, font, rows, cols):
                     value = board.grid[row][col]
                     if value is not None:
                         current_number = value
-                        board.paths[current_number] = [(row, col)]
+                        board.set_path(current_number, [(row, col)])
                         dragging = True
 
             elif event.type == pygame.MOUSEMOTION and dragging:
@@ -112,115 +133,100 @@ def run_manual_game(screen, board, font, rows, cols):
 
     
 
-def has_dead_end(board, occupied):
-    for r in range(board.rows):
-        for c in range(board.cols):
-            cell = (r, c)
-            if cell in occupied or board.grid[r][c] is not None:
-                continue
-            accessible = False
-            for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < board.rows and 0 <= nc < board.cols:
-                    neigh = (nr, nc)
-                    if neigh not in occupied and board.grid[nr][nc] is None:
-                        accessible = True
-                        break
-            if not accessible:
-                return True
-    return False
-
-
-
-def a_star_all_paths(start, goal, occupied, board, max_paths=2000):
-    paths = []
-    pq = []
-    heapq.heappush(pq, (0, [start]))  # (priority, path)
-    number = board.grid[start[0]][start[1]]
-
-    while pq and len(paths) < max_paths:
-        _, path = heapq.heappop(pq)
-        cur = path[-1]
-        if cur == goal:
-            paths.append(path)
-            continue
-        r, c = cur
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = r + dr, c + dc
-            neigh = (nr, nc)
-
-            if not (0 <= nr < board.rows and 0 <= nc < board.cols):
-                continue
-
-            if neigh in occupied and neigh != goal:
-                continue
-
-            if neigh in path:
-                continue
-
-            cell_value = board.grid[nr][nc]
-            if cell_value is not None and cell_value != number and neigh != goal:
-                continue
-
-
-            # Calculate priority using Manhattan distance
-            priority = len(path) + abs(nr - goal[0]) + abs(nc - goal[1])
-            heapq.heappush(pq, (priority, path + [neigh]))
-    return paths
-
-def run_solver2(screen, board, font):
-    rows, cols = board.rows, board.cols
-
-    pairs_list = []
-    for number, positions in board.pairs.items():
-        (r1, c1), (r2, c2) = positions
-        dist = abs(r1 - r2) + abs(c1 - c2)
-        pairs_list.append((number, (r1, c1), (r2, c2), dist))
-    pairs_list.sort(key=lambda x: x[3])
-
-
-    occupied = set()
-    for number, positions in board.pairs.items():
-        for pos in positions:
-            occupied.add(pos)
-    board.paths.clear()
-
-    pairs_order = [(num, start, goal) for (num, start, goal, _) in pairs_list]
-
-    def solve(idx):
-        if idx >= len(pairs_order) and is_game_completed(board):
-            return True
-        number, start, goal = pairs_order[idx]
-        paths = a_star_all_paths(start, goal, occupied, board)
-        for path in paths:
-            board.paths[number] = path
-            for cell in path:
-                occupied.add(cell)
-
-
-            if has_dead_end(board, occupied):
-                for cell in path:
-                    occupied.discard(cell)
-                board.paths.pop(number, None)
-                continue
-
-            draw_board(screen, board, font)
-            pygame.display.flip()
-            pygame.time.delay(5)
-            pygame.event.pump()
-
-            if solve(idx + 1):
-                return True
-            for cell in path:
-                occupied.discard(cell)
-            board.paths.pop(number, None)
-        return False
-
-    success = solve(0)
-    draw_board(screen, board, font)
+# Espera tras cada colocación para cada velocidad del modo visual (0 = sin freno)
+SOLVER_DELAYS = [0.0, 0.001, 0.005, 0.02, 0.1, 0.5]
+
+
+def _animate_search(screen, board, renderer, runner, fps):
+    # Dibuja la búsqueda en curso hasta que termina; False si se cierra la ventana
+    import pygame
+
+    clock = pygame.time.Clock()
+    speed = 0
+    version = None
+
+    # La búsqueda no espera a la pantalla; solo se dibuja la última copia publicada
+    while not runner.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                runner.stop()
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    runner.toggle()
+                elif event.key == pygame.K_RIGHT:
+                    if runner.paused:
+                        runner.step()
+                    else:
+                        runner.pause()
+                elif event.key == pygame.K_UP:
+                    speed = max(speed - 1, 0)
+                elif event.key == pygame.K_DOWN:
+                    speed = min(speed + 1, len(SOLVER_DELAYS) - 1)
+                elif event.key == pygame.K_ESCAPE:
+                    runner.stop()
+        runner.delay = SOLVER_DELAYS[speed]
+
+        current, paths = runner.snapshot()
+        if current != version:
+            version = current
+            board.set_paths(paths)
+            pygame.display.update(renderer.draw(screen))
+        state = "en pausa" if runner.paused else f"velocidad {len(SOLVER_DELAYS) - speed}"
+        pygame.display.set_caption(f"NumberLink - resolviendo ({state}, "
+                                   f"{runner.placements} colocaciones)")
+        clock.tick(fps)
+    return True
+
+
+def run_solver2(screen, board, font, tracer=None, profile=None, fps=30, cache=None,
+                timeout=None):
+    """
+    Resuelve en un hilo aparte y muestra el último estado de la búsqueda a
+    'fps' imágenes por segundo. Controles: espacio pausa/reanuda, flecha
+    derecha avanza una colocación (en pausa), arriba/abajo cambian la
+    velocidad y Escape o cerrar la ventana cancelan la búsqueda. Con timeout
+    (segundos) la búsqueda se detiene sola; si no termina, se muestra la mejor
+    solución parcial encontrada.
+
+    Si se pasa una solution_cache.SolutionCache y el tablero (en cualquier
+    orientación) ya está en ella, se muestra sin buscar; las soluciones nuevas
+    se guardan (ver solution_cache.solve_cached). Devuelve el SearchRunner
+    usado, con el resultado y el perfil si se pidió.
+    """
+    import pygame
+
+    renderer = BoardRenderer(board, font)
+    partial = {}
+    runner = SearchRunner(board, sample_interval=1 / fps, profile_output=profile, cache=cache,
+                          tracer=tracer, timeout=timeout).start()
+    if not _animate_search(screen, board, renderer, runner, fps):
+        return runner
+    paths = runner.result
+    if runner.error is not None:
+        status = "error"
+    else:
+        status = runner.outcome.status
+        partial = runner.outcome.best
+    if runner.outcome is not None and runner.outcome.cached:
+        caption = "NumberLink - solución en caché"
+    else:
+        caption = f"NumberLink - {runner.elapsed:.2f} s"
+
+    board.set_paths(paths or partial)
+    success = paths is not None
+    renderer.draw(screen)
+    pygame.display.set_caption(caption)
     if success and is_game_completed(board):
         msg = "¡Tablero resuelto (BFS-backtracking)!"
         color = (0, 128, 0)
+    elif status in ("timeout", "cancelled"):
+        reason = "Tiempo agotado" if status == "timeout" else "Búsqueda cancelada"
+        msg = f"{reason}: {len(partial)} de {len(board.pairs)} pares unidos."
+        color = (255, 128, 0)
+    elif status == "error":
+        msg = f"Error del solucionador: {type(runner.error).__name__}: {runner.error}"
+        color = (255, 0, 0)
     else:
         msg = "No se encontró solución."
         color = (255, 0, 0)
@@ -237,10 +243,29 @@ def run_solver2(screen, board, font):
             elif event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_SPACE, pygame.K_ESCAPE):
                     waiting = False
-def main():
+    return runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NumberLink")
+    parser.add_argument("board_file", nargs="?", default="example.txt",
+                        help="tablero a cargar (por defecto, example.txt)")
+    parser.add_argument("--trace", metavar="JSON", default=None,
+                        help="guardar las trazas del solucionador (fases, profundidades) en JSON")
+    parser.add_argument("--profile", metavar="PROF", default=None,
+                        help="perfilar el solucionador con cProfile y guardar las estadísticas")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="segundos máximos para el solucionador automático")
+    parser.add_argument("--cache", metavar="SQLITE", default=DEFAULT_CACHE_PATH,
+                        help=f"caché de soluciones (por defecto, {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="resolver siempre, sin consultar ni guardar en la caché")
+    args = parser.parse_args(argv)
+
+    import pygame
     pygame.init()
 
-    rows, cols, pairs = read_board_file("example.txt")
+    rows, cols, pairs = read_board_file(args.board_file)
     board = Board(rows, cols, pairs)
 
     width = MARGIN * 2 + cols * CELL_SIZE
@@ -253,7 +278,21 @@ def main():
     choice = show_menu(screen, font)
 
     if choice == 1:
-        run_solver2(screen, board, font)
+        tracer = Tracer() if args.trace else None
+        # Con trazas o perfil se quiere ver la búsqueda, no la caché
+        use_cache = not (args.no_cache or args.trace or args.profile)
+        cache = SolutionCache(args.cache) if use_cache else None
+        try:
+            runner = run_solver2(screen, board, font, tracer, args.profile, cache=cache,
+                                 timeout=args.timeout)
+        finally:
+            if cache is not None:
+                cache.close()
+        if runner.profile_report:
+            print(runner.profile_report)
+        if tracer is not None:
+            tracer.dump_json(args.trace)
+            print(tracer.summary())
     else:
         run_manual_game(screen, board, font, rows, cols)
 
@@ -0,0 +1,125 @@
+# parallel.py
+#
+# Búsqueda en paralelo para un único tablero difícil: se reparte el árbol de
+# búsqueda cortándolo en los primeros niveles, cada subárbol se resuelve en un
+# proceso y en cuanto uno encuentra solución se cancela el resto.
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from board import Board
+from solver import Search, SearchCancelled
+
+_cancel = None  # evento compartido, fijado en cada proceso por _init_worker
+
+
+def _init_worker(cancel):
+    global _cancel
+    _cancel = cancel
+
+
+def iter_subtrees(board, depth=1, max_paths=2000, cancel=None):
+    """
+    Genera los prefijos de la búsqueda hasta 'depth' niveles, con la misma poda
+    que Search y en el orden en que los probaría la búsqueda secuencial. Cada
+    prefijo es una lista [(número, camino), ...] que define un subárbol
+    independiente. Trabaja sobre una copia del tablero.
+
+    Si cancel (objeto con is_set()) se activa, deja de generar prefijos, también
+    a mitad de enumerar o probar los caminos de un par.
+    """
+    search = Search(Board(board.rows, board.cols, board.pairs), max_paths, cancel=cancel)
+    prefix = []
+
+    def expand(level):
+        if search.failed:
+            return
+        if level == depth or not search.remaining:
+            yield list(prefix)
+            return
+        pair, paths = search.choose()
+        if pair is None:
+            return
+        for path in paths:
+            if cancel is not None and cancel.is_set():
+                return
+            if search.place(pair[0], path):
+                prefix.append((pair[0], path))
+                yield from expand(level + 1)
+                prefix.pop()
+                search.undo()
+
+    def generate():
+        try:
+            yield from expand(0)
+        except SearchCancelled:
+            return
+
+    return generate()
+
+
+def _solve_subtree(rows, cols, pairs, prefix, max_paths):
+    board = Board(rows, cols, pairs)
+    search = Search(board, max_paths, cancel=_cancel)
+    if search.failed:
+        return None
+    for number, path in prefix:
+        if not search.place(number, path):
+            return None
+    try:
+        return search.run()
+    except SearchCancelled:
+        return None
+
+
+def solve_parallel(board, workers=None, depth=1, max_paths=2000):
+    """
+    Como solver.solve, pero repartiendo los subárboles de los primeros 'depth'
+    niveles (1 o 2) entre 'workers' procesos (por defecto, uno por núcleo).
+    Los subárboles se envían a medida que se generan, así que los procesos
+    empiezan enseguida. En cuanto un proceso devuelve una solución se activa
+    el evento de cancelación: los demás procesos lo ven y la generación de
+    subárboles en este proceso se detiene. Devuelve la primera solución que
+    encuentre cualquiera de ellos, o None.
+    """
+    workers = workers or os.cpu_count() or 1
+    cancel = multiprocessing.Event()
+    subtrees = iter_subtrees(board, depth, max_paths, cancel)
+
+    def finished(future):
+        # Se llama en el hilo del pool al acabar cada subárbol
+        if not future.cancelled() and future.exception() is None and future.result() is not None:
+            cancel.set()
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cancel,))
+    paths = None
+    pending = set()
+    exhausted = False
+    try:
+        while paths is None:
+            # Mantiene la cola llena sin generar todos los subárboles de golpe
+            while not exhausted and len(pending) < 2 * workers:
+                prefix = None if cancel.is_set() else next(subtrees, None)
+                if prefix is None:
+                    exhausted = True
+                else:
+                    future = pool.submit(_solve_subtree, board.rows, board.cols,
+                                         board.pairs, prefix, max_paths)
+                    future.add_done_callback(finished)
+                    pending.add(future)
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result() is not None:
+                    paths = future.result()
+                    break
+    finally:
+        # Avisa a los procesos en marcha y descarta los subárboles sin empezar
+        cancel.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    board.clear_paths()
+    if paths is not None:
+        board.set_paths(paths)
+    return paths
@@ -0,0 +1,112 @@
+# pruning.py
+#
+# Detección incremental de callejones sin salida. En lugar de recorrer todo el
+# tablero tras cada camino colocado, se mantiene para cada celda el número de
+# vecinos libres y solo se actualiza el vecindario de las celdas que cambian.
+
+
+class DeadEndChecker:
+    def __init__(self, board, occupied):
+        self.board = board
+        self.free = board.free_mask(occupied)
+        # free_count[i]: vecinos libres de la celda i (libre o no)
+        self.free_count = [bin(mask & self.free).count("1") for mask in board.neighbor_masks]
+        # Número de celdas libres sin ningún vecino libre
+        self.dead = 0
+        for i, count in enumerate(self.free_count):
+            if count == 0 and self.free >> i & 1:
+                self.dead += 1
+
+    def occupy(self, mask):
+        # Marca como ocupadas las celdas libres de 'mask'
+        mask &= self.free
+        free_count = self.free_count
+        neighbors = self.board.neighbors
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            i = low.bit_length() - 1
+            self.free ^= low
+            if free_count[i] == 0:
+                self.dead -= 1
+            for j in neighbors[i]:
+                free_count[j] -= 1
+                if free_count[j] == 0 and self.free >> j & 1:
+                    self.dead += 1
+
+    def release(self, mask):
+        # Devuelve a libres las celdas de 'mask' (sin contar los extremos)
+        mask &= ~self.free & ~self.board.endpoint_mask
+        free_count = self.free_count
+        neighbors = self.board.neighbors
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            i = low.bit_length() - 1
+            for j in neighbors[i]:
+                if free_count[j] == 0 and self.free >> j & 1:
+                    self.dead -= 1
+                free_count[j] += 1
+            self.free |= low
+            if free_count[i] == 0:
+                self.dead += 1
+
+    def has_dead_end(self, pairs=None):
+        """
+        Mismo criterio que solver.has_dead_end, en O(1). Si se pasan los pares
+        pendientes [(número, inicio, fin)], una celda aislada no cuenta cuando
+        toca los dos extremos de uno de ellos: ese par puede pasar por ella.
+        """
+        if self.dead == 0 or pairs is None:
+            return self.dead > 0
+        board = self.board
+        spans = [board.bit(*start) | board.bit(*goal) for _, start, goal in pairs]
+        isolated = self.free & ~board.expand(self.free)
+        while isolated:
+            low = isolated & -isolated
+            isolated ^= low
+            around = board.neighbor_masks[low.bit_length() - 1]
+            if not any(around & span == span for span in spans):
+                return True
+        return False
+
+    def regions(self):
+        # Componentes conexas de celdas libres, como máscaras
+        board = self.board
+        regions = []
+        pending = self.free
+        while pending:
+            region = pending & -pending
+            while True:
+                grown = (region | board.expand(region)) & self.free
+                if grown == region:
+                    break
+                region = grown
+            regions.append(region)
+            pending &= ~region
+        return regions
+
+    def is_stranded(self, pairs):
+        """
+        Comprobaciones más fuertes sobre los pares pendientes [(número, inicio, fin)]:
+          - cada región libre debe tocar ambos extremos de algún par pendiente,
+            porque solo un camino de ese par puede rellenarla;
+          - cada par pendiente debe tener sus extremos adyacentes o tocando una
+            misma región libre.
+        Devuelve True si alguna falla y la rama no tiene solución.
+        """
+        board = self.board
+        regions = self.regions()
+        touches = [board.expand(region) for region in regions]
+        served = 0  # bit k activo si la región k tiene algún par que la rellene
+        for _, start, goal in pairs:
+            start_bit = board.bit(*start)
+            goal_bit = board.bit(*goal)
+            connected = bool(board.neighbor_masks[board.index(*start)] & goal_bit)
+            for k, touch in enumerate(touches):
+                if touch & start_bit and touch & goal_bit:
+                    served |= 1 << k
+                    connected = True
+            if not connected:
+                return True
+        return served != (1 << len(regions)) - 1
@@ -0,0 +1,129 @@
+# puzzle_pack.py
+#
+# Formato binario para colecciones grandes de tableros: un solo archivo con
+# todos los tableros empaquetados y un índice de desplazamientos al final, de
+# modo que se puede abrir con mmap y leer el tablero i sin tocar los demás.
+#
+#   cabecera  MAGIC (8 bytes)
+#   tableros  filas, columnas, nº de pares (uint16) y por par
+#             número, r1, c1, r2, c2 (uint16), coordenadas base 0
+#   índice    desplazamiento de cada tablero (uint64)
+#   pie       desplazamiento del índice, nº de tableros (uint64) y MAGIC
+#
+# Todo en little-endian.
+#
+#   python puzzle_pack.py corpus.nlp tableros1.txt tableros2.txt.gz ...
+import argparse
+import mmap
+import struct
+
+from board_parser import BoardFormatError, iter_boards
+
+MAGIC = b"NLPACK01"
+_BOARD = struct.Struct("<3H")
+_PAIR = struct.Struct("<5H")
+_OFFSET = struct.Struct("<Q")
+_FOOTER = struct.Struct("<2Q8s")
+
+
+def pack_board(rows, cols, pairs):
+    chunks = [_BOARD.pack(rows, cols, len(pairs))]
+    for number, ((r1, c1), (r2, c2)) in sorted(pairs.items()):
+        chunks.append(_PAIR.pack(number, r1, c1, r2, c2))
+    return b"".join(chunks)
+
+
+def unpack_board(buffer, offset=0):
+    rows, cols, count = _BOARD.unpack_from(buffer, offset)
+    offset += _BOARD.size
+    pairs = {}
+    for number, r1, c1, r2, c2 in _PAIR.iter_unpack(buffer[offset:offset + count * _PAIR.size]):
+        pairs[number] = [(r1, c1), (r2, c2)]
+    return rows, cols, pairs
+
+
+def write_pack(filename, boards):
+    """
+    Escribe los tableros (iterable de (filas, columnas, pares)) en 'filename'
+    a medida que llegan, sin tenerlos todos en memoria salvo el índice.
+    Devuelve cuántos se han escrito.
+    """
+    offsets = []
+    with open(filename, "wb") as output:
+        output.write(MAGIC)
+        position = len(MAGIC)
+        for rows, cols, pairs in boards:
+            data = pack_board(rows, cols, pairs)
+            offsets.append(position)
+            output.write(data)
+            position += len(data)
+        for offset in offsets:
+            output.write(_OFFSET.pack(offset))
+        output.write(_FOOTER.pack(position, len(offsets), MAGIC))
+    return len(offsets)
+
+
+class PuzzlePack:
+    """
+    Acceso aleatorio a un archivo de write_pack mediante mmap: pack[i]
+    devuelve (filas, columnas, pares) leyendo solo ese tablero.
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._file.close()
+            raise BoardFormatError(f"{filename}: no es un archivo de tableros") from None
+        size = len(self._map)
+        if size < len(MAGIC) + _FOOTER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise BoardFormatError(f"{filename}: no es un archivo de tableros")
+        self._index, self._count, magic = _FOOTER.unpack_from(self._map, size - _FOOTER.size)
+        if magic != MAGIC or self._index + self._count * _OFFSET.size != size - _FOOTER.size:
+            self.close()
+            raise BoardFormatError(f"{filename}: índice dañado o archivo truncado")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("índice de tablero fuera de rango")
+        offset, = _OFFSET.unpack_from(self._map, self._index + i * _OFFSET.size)
+        return unpack_board(self._map, offset)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Empaqueta tableros de texto en un archivo binario.")
+    parser.add_argument("output", help="archivo empaquetado de salida")
+    parser.add_argument("inputs", nargs="+", help="archivos de tableros (.txt o .txt.gz)")
+    args = parser.parse_args(argv)
+
+    def boards():
+        for filename in args.inputs:
+            yield from iter_boards(filename)
+
+    count = write_pack(args.output, boards())
+    print(f"{count} tableros escritos en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
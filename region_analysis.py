@@ -0,0 +1,92 @@
+# region_analysis.py
+#
+# Análisis de regiones libres con NumPy (opcional): etiqueta las componentes
+# conexas de celdas libres de todo el tablero con operaciones vectorizadas y
+# comprueba en bloque, para todos los pares pendientes a la vez, que sus dos
+# extremos tocan una región común y que cada región toca algún par que pueda
+# rellenarla. Es la misma poda que pruning.DeadEndChecker.is_stranded, pero sin
+# bucles de Python por región ni por par.
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él solo queda el motor por bits
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+class RegionAnalyzer:
+    """
+    Precalcula para un tablero la tabla de vecinos en forma de matriz
+    (celda -> 4 vecinos, con la propia celda como relleno) para poder etiquetar
+    regiones y consultar las de los extremos de todos los pares de golpe.
+    """
+
+    def __init__(self, board):
+        if np is None:
+            raise RuntimeError("region_analysis necesita NumPy (pip install numpy)")
+        self.board = board
+        size = board.size
+        self.size = size
+        self._nbytes = (size + 7) // 8
+        table = np.arange(size, dtype=np.int64)[:, None].repeat(4, axis=1)
+        for i, neighs in enumerate(board.neighbors):
+            table[i, :len(neighs)] = neighs
+        self.neighbors = table  # (size, 4); los huecos repiten la celda
+
+    def free_array(self, free):
+        # Máscara de bits de celdas libres -> vector booleano de longitud size
+        raw = np.frombuffer(free.to_bytes(self._nbytes, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little")[:self.size].astype(bool)
+
+    def label(self, free):
+        """
+        Etiqueta las regiones libres. Devuelve un vector con, para cada celda
+        libre, el menor índice de su región, y -1 para las ocupadas.
+
+        Cada vuelta toma el mínimo entre la etiqueta de cada celda y las de sus
+        cuatro vecinos (con desplazamientos de la matriz, sin bucles) y después
+        salta punteros (etiqueta de la etiqueta), lo que acorta mucho las
+        regiones largas y estrechas.
+        """
+        free = self.free_array(free) if isinstance(free, int) else free
+        rows, cols = self.board.rows, self.board.cols
+        sentinel = self.size  # mayor que cualquier índice válido
+        labels = np.where(free, np.arange(self.size), sentinel)
+        while True:
+            grid = labels.reshape(rows, cols)
+            new = grid.copy()
+            np.minimum(new[1:, :], grid[:-1, :], out=new[1:, :])
+            np.minimum(new[:-1, :], grid[1:, :], out=new[:-1, :])
+            np.minimum(new[:, 1:], grid[:, :-1], out=new[:, 1:])
+            np.minimum(new[:, :-1], grid[:, 1:], out=new[:, :-1])
+            new = np.where(free, new.ravel(), sentinel)
+            # Las etiquetas de celdas libres son índices de celdas libres
+            new = np.where(free, new[np.where(free, new, 0)], sentinel)
+            if np.array_equal(new, labels):
+                break
+            labels = new
+        return np.where(free, labels, -1)
+
+    def is_stranded(self, free, pairs):
+        """
+        Mismo criterio que DeadEndChecker.is_stranded para la máscara de celdas
+        libres 'free' y los pares pendientes [(número, inicio, fin)]: True si
+        algún par no puede unir sus extremos o alguna región no la puede
+        rellenar ningún par.
+        """
+        if not pairs:
+            return free != 0
+        cols = self.board.cols
+        labels = self.label(free)
+        heads = np.array([(r1 * cols + c1, r2 * cols + c2)
+                          for _, (r1, c1), (r2, c2) in pairs])
+        # Etiquetas de las regiones que toca cada extremo: (pares, 4)
+        around_a = labels[self.neighbors[heads[:, 0]]]
+        around_b = labels[self.neighbors[heads[:, 1]]]
+        shared = (around_a[:, :, None] == around_b[:, None, :]) & (around_a[:, :, None] >= 0)
+        adjacent = (self.neighbors[heads[:, 0]] == heads[:, 1:2]).any(axis=1)
+        if not (shared.any(axis=(1, 2)) | adjacent).all():
+            return True
+        regions = np.unique(labels[labels >= 0])
+        served = np.unique(np.broadcast_to(around_a[:, :, None], shared.shape)[shared])
+        return bool(len(regions) != len(np.intersect1d(regions, served, assume_unique=True)))
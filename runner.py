@@ -0,0 +1,140 @@
+# runner.py
+#
+# Búsqueda en un hilo aparte para la visualización: el hilo resuelve sin
+# esperar a la pantalla y la interfaz toma una copia del último estado cuando
+# le toca dibujar (a FPS fijos). Permite pausar, avanzar colocación a
+# colocación y frenar la búsqueda a propósito para verla.
+import threading
+import time
+
+from board import Board
+from instrumentation import profile_call
+from solution_cache import solve_cached
+
+
+class SearchRunner:
+    """
+    Controla una búsqueda en segundo plano sobre una copia del tablero.
+
+    snapshot() devuelve los caminos del último estado publicado; el hilo solo
+    copia el estado cuando ha pasado sample_interval desde la copia anterior
+    (o cuando va a detenerse), así que publicar no frena la búsqueda.
+    delay añade una espera tras cada colocación (0 = sin freno).
+
+    Con profile_output la búsqueda se perfila con cProfile dentro del hilo (un
+    perfil del hilo principal no la vería); el informe queda en profile_report.
+
+    Con cache (una solution_cache.SolutionCache) la búsqueda pasa por
+    solve_cached: si el tablero ya está guardado no se busca y outcome.cached
+    es True; las soluciones nuevas se guardan.
+
+    Si la búsqueda lanza una excepción, el hilo termina igualmente: la
+    excepción queda en error y outcome en None.
+    """
+
+    def __init__(self, board, sample_interval=1 / 30, delay=0.0, profile_output=None,
+                 cache=None, **solve_options):
+        self.board = Board(board.rows, board.cols, board.pairs)
+        self.sample_interval = sample_interval
+        self.delay = delay
+        self.profile_output = profile_output
+        self.cache = cache
+        self.solve_options = solve_options
+        self.result = None  # solución, o None
+        self.outcome = None  # solver.SolveResult con el estado y la mejor solución parcial
+        self.elapsed = None
+        self.placements = 0
+        self.profile_report = None
+        self.error = None  # excepción de la búsqueda, si la hubo
+
+        self._cancel = threading.Event()
+        self._running = threading.Event()  # borrado = en pausa
+        self._running.set()
+        self._steps = 0  # colocaciones pendientes en modo paso a paso
+        self._lock = threading.Lock()
+        self._snapshot = {}
+        self._version = 0
+        self._last_sample = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        options = dict(self.solve_options, progress=self._progress, cancel=self._cancel)
+        try:
+            if self.profile_output is None:
+                self.outcome = solve_cached(self.board, self.cache, **options)
+            else:
+                self.outcome, self.profile_report = profile_call(solve_cached, self.board,
+                                                                 self.cache,
+                                                                 output=self.profile_output,
+                                                                 **options)
+            self.result = self.outcome.paths
+        except Exception as exc:
+            # Sin esto el hilo moriría en silencio y la interfaz esperaría un outcome
+            self.error = exc
+        self.elapsed = time.perf_counter() - start
+        self._publish()
+
+    def _publish(self):
+        paths = {number: list(path) for number, path in self.board.paths.items()}
+        with self._lock:
+            self._snapshot = paths
+            self._version += 1
+        self._last_sample = time.perf_counter()
+
+    def _progress(self, board):
+        # Se llama en el hilo de la búsqueda tras cada colocación aceptada
+        self.placements += 1
+        paused = not self._running.is_set()
+        if paused or self.delay or time.perf_counter() - self._last_sample >= self.sample_interval:
+            self._publish()
+        if self.delay:
+            time.sleep(self.delay)
+        self._running.wait()
+        with self._lock:
+            if self._steps:
+                self._steps -= 1
+                if not self._steps:
+                    self._running.clear()
+
+    def snapshot(self):
+        # (versión, caminos) del último estado publicado; la versión cambia con él
+        with self._lock:
+            return self._version, self._snapshot
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        with self._lock:
+            self._steps = 0
+        self._running.set()
+
+    def toggle(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self, count=1):
+        # En pausa, deja avanzar 'count' colocaciones más y vuelve a pausar
+        with self._lock:
+            self._steps = count
+        self._running.set()
+
+    def stop(self):
+        # Cancela la búsqueda (también si estaba en pausa) y espera al hilo
+        self._cancel.set()
+        self._running.set()
+        self._thread.join()
+
+    def done(self):
+        return self._thread.ident is not None and not self._thread.is_alive()
@@ -0,0 +1,177 @@
+# sat_solver.py
+#
+# Motor alternativo: codifica el tablero como una fórmula SAT y la resuelve con
+# cdcl.CDCLSolver (o con minisat si está instalado). Es mucho más robusto que la
+# enumeración de caminos en tableros grandes con pares largos y sinuosos.
+#
+# Variables:
+#   - color(i, k): la celda i pertenece al número k (exactamente uno por celda)
+#   - edge(i, j): las celdas vecinas i y j son consecutivas en algún camino
+# Restricciones:
+#   - un extremo tiene exactamente una arista y el color de su número
+#   - una celda libre tiene exactamente dos aristas
+#   - las dos celdas de una arista tienen el mismo color
+# Esto admite ciclos aislados sin extremos. Los de 2x2 se prohíben de antemano;
+# si aparecen otros en el modelo se bloquean con una cláusula y se vuelve a
+# resolver.
+from itertools import combinations
+
+from cdcl import CDCLSolver, solve_with_minisat, minisat_path
+
+
+class SatEncoding:
+    def __init__(self, board):
+        self.board = board
+        self.numbers = sorted(board.pairs)
+        self.num_vars = 0
+        self.clauses = []
+
+        self.color_vars = []  # índice de celda -> {número: variable}
+        for _ in range(board.size):
+            self.color_vars.append({k: self._new_var() for k in self.numbers})
+
+        self.edge_vars = {}  # (i, j) con i < j -> variable
+        self.cell_edges = [[] for _ in range(board.size)]  # índice -> [(vecino, variable)]
+        for i in range(board.size):
+            for j in board.neighbors[i]:
+                if i < j:
+                    var = self._new_var()
+                    self.edge_vars[(i, j)] = var
+                    self.cell_edges[i].append((j, var))
+                    self.cell_edges[j].append((i, var))
+
+        endpoints = {}
+        for number, positions in board.pairs.items():
+            for r, c in positions:
+                endpoints[board.index(r, c)] = number
+
+        for i in range(board.size):
+            colors = list(self.color_vars[i].values())
+            self.clauses.append(colors)
+            for a, b in combinations(colors, 2):
+                self.clauses.append([-a, -b])
+
+            edges = [var for _, var in self.cell_edges[i]]
+            if i in endpoints:
+                self.clauses.append([self.color_vars[i][endpoints[i]]])
+                self._exactly(edges, 1)
+            else:
+                self._exactly(edges, 2)
+
+        # Un bloque 2x2 con sus cuatro aristas sería un ciclo cerrado: se prohíbe
+        cols = board.cols
+        for r in range(board.rows - 1):
+            for c in range(cols - 1):
+                i = r * cols + c
+                self.clauses.append([-self.edge_vars[(i, i + 1)], -self.edge_vars[(i, i + cols)],
+                                     -self.edge_vars[(i + 1, i + 1 + cols)],
+                                     -self.edge_vars[(i + cols, i + 1 + cols)]])
+
+        for (i, j), var in self.edge_vars.items():
+            for k in self.numbers:
+                self.clauses.append([-var, -self.color_vars[i][k], self.color_vars[j][k]])
+                self.clauses.append([-var, self.color_vars[i][k], -self.color_vars[j][k]])
+
+    def _new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def _exactly(self, lits, n):
+        # Codificación directa; como mucho hay cuatro aristas por celda
+        if len(lits) < n:
+            self.clauses.append([])
+            return
+        for subset in combinations(lits, n + 1):
+            self.clauses.append([-v for v in subset])
+        for subset in combinations(lits, len(lits) - n + 1):
+            self.clauses.append(list(subset))
+
+    def edges_of(self, paths):
+        # Variables de arista usadas por unos caminos {número: camino}
+        board = self.board
+        edges = []
+        for path in paths.values():
+            for (r1, c1), (r2, c2) in zip(path, path[1:]):
+                i, j = board.index(r1, c1), board.index(r2, c2)
+                edges.append(self.edge_vars[(min(i, j), max(i, j))])
+        return edges
+
+    def decode(self, model):
+        """
+        Reconstruye {número: camino} siguiendo las aristas desde el primer
+        extremo de cada par. Devuelve (caminos, ciclos), donde ciclos es una
+        lista de listas de variables de arista que no llegan a ningún extremo.
+        """
+        board = self.board
+        linked = [[j for j, var in self.cell_edges[i] if model[var]] for i in range(board.size)]
+        visited = set()
+        paths = {}
+        for number, positions in board.pairs.items():
+            start = board.index(*positions[0])
+            path = [start]
+            prev, cur = None, start
+            while True:
+                nxt = [j for j in linked[cur] if j != prev]
+                if not nxt:
+                    break
+                prev, cur = cur, nxt[0]
+                path.append(cur)
+            visited.update(path)
+            paths[number] = [board.position(i) for i in path]
+
+        cycles = []
+        for i in range(board.size):
+            if i in visited:
+                continue
+            cycle = []
+            prev, cur = None, i
+            while cur not in visited:
+                visited.add(cur)
+                nxt = [j for j in linked[cur] if j != prev]
+                if prev is None:
+                    nxt = nxt[:1]
+                if not nxt:
+                    break
+                cycle.append(self.edge_vars[(min(cur, nxt[0]), max(cur, nxt[0]))])
+                prev, cur = cur, nxt[0]
+            cycles.append(cycle)
+        return paths, cycles
+
+
+def solve_sat(board, backend="auto", exclude=()):
+    """
+    Resuelve el tablero con la codificación SAT. Devuelve {número: camino} como
+    solver.solve (y deja la solución en board.paths), o None si no tiene
+    solución. backend: "python", "minisat" o "auto" (minisat si está instalado).
+
+    exclude es una lista de soluciones {número: camino} que no se aceptan; con
+    la solución conocida sirve para comprobar si el tablero tiene otra.
+    """
+    encoding = SatEncoding(board)
+    use_minisat = backend == "minisat" or (backend == "auto" and minisat_path())
+    clauses = list(encoding.clauses)
+    for paths in exclude:
+        clauses.append([-var for var in encoding.edges_of(paths)])
+    if not use_minisat:
+        solver = CDCLSolver(encoding.num_vars)
+        for clause in clauses:
+            solver.add_clause(clause)
+
+    board.clear_paths()
+    while True:
+        if use_minisat:
+            model = solve_with_minisat(encoding.num_vars, clauses)
+        else:
+            model = solver.solve()
+        if model is None:
+            return None
+        paths, cycles = encoding.decode(model)
+        if not cycles:
+            board.set_paths(paths)
+            return dict(board.paths)
+        # Prohíbe los ciclos encontrados y vuelve a resolver
+        for cycle in cycles:
+            blocking = [-var for var in cycle]
+            clauses.append(blocking)
+            if not use_minisat:
+                solver.add_clause(blocking)
@@ -0,0 +1,161 @@
+# solution_cache.py
+#
+# Caché persistente de soluciones (SQLite). La clave es una huella canónica
+# del tablero que no cambia al girarlo, reflejarlo o renumerar los pares, así
+# que un tablero ya resuelto en cualquier orientación no vuelve a pasar por el
+# solucionador: la solución guardada se transforma a la orientación pedida.
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from solver import SearchStats, SolveResult, solve_bounded
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "numberlink", "solutions.sqlite")
+
+# Las 8 simetrías del rectángulo: (r, c, filas, columnas) -> (r', c'). Las que
+# intercambian filas y columnas se marcan con True.
+SYMMETRIES = [
+    (lambda r, c, R, C: (r, c), False),
+    (lambda r, c, R, C: (r, C - 1 - c), False),
+    (lambda r, c, R, C: (R - 1 - r, c), False),
+    (lambda r, c, R, C: (R - 1 - r, C - 1 - c), False),
+    (lambda r, c, R, C: (c, r), True),
+    (lambda r, c, R, C: (c, R - 1 - r), True),
+    (lambda r, c, R, C: (C - 1 - c, r), True),
+    (lambda r, c, R, C: (C - 1 - c, R - 1 - r), True),
+]
+
+
+def canonical_form(rows, cols, pairs):
+    """
+    Forma canónica del tablero: de las 8 simetrías, la menor tupla
+    (filas, columnas, pares) con cada par como (celda menor, celda mayor) y los
+    pares ordenados, sin sus números. Devuelve (forma, simetría, orden), donde
+    orden[k] es el número original del par k de la forma canónica y
+    'simetría' el índice en SYMMETRIES que la produce.
+    """
+    best = None
+    for k, (transform, swaps) in enumerate(SYMMETRIES):
+        dims = (cols, rows) if swaps else (rows, cols)
+        keyed = []
+        for number, (a, b) in pairs.items():
+            a = transform(a[0], a[1], rows, cols)
+            b = transform(b[0], b[1], rows, cols)
+            keyed.append((min(a, b), max(a, b), number))
+        keyed.sort()
+        form = (dims, tuple((a, b) for a, b, _ in keyed))
+        if best is None or form < best[0]:
+            best = (form, k, [number for _, _, number in keyed])
+    return best
+
+
+def _digest(form):
+    return hashlib.sha256(repr(form).encode()).hexdigest()
+
+
+def fingerprint(rows, cols, pairs):
+    form, _, _ = canonical_form(rows, cols, pairs)
+    return _digest(form)
+
+
+def _inverse(symmetry, rows, cols):
+    # Función que deshace SYMMETRIES[symmetry] sobre un tablero rows x cols
+    transform = SYMMETRIES[symmetry][0]
+    table = {}
+    for r in range(rows):
+        for c in range(cols):
+            table[transform(r, c, rows, cols)] = (r, c)
+    return table.__getitem__
+
+
+class SolutionCache:
+    """
+    Almacén de soluciones en un archivo SQLite. get() y put() reciben el
+    tablero en cualquier orientación y numeración; internamente la solución se
+    guarda en la orientación canónica, con un camino por par canónico.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        # La interfaz la abre en el hilo principal y la usa desde el hilo de
+        # runner.SearchRunner (nunca a la vez)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                         "(fingerprint TEXT PRIMARY KEY, rows INTEGER, cols INTEGER, "
+                         "paths TEXT NOT NULL)")
+        self._db.commit()
+
+    def get(self, board):
+        """
+        Devuelve {número: camino} para 'board' si el tablero (o una rotación,
+        reflexión o renumeración suya) está guardado, o None.
+        """
+        form, symmetry, order = canonical_form(board.rows, board.cols, board.pairs)
+        row = self._db.execute("SELECT paths FROM solutions WHERE fingerprint = ?",
+                               (_digest(form),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        back = _inverse(symmetry, board.rows, board.cols)
+        paths = {}
+        for number, path in zip(order, json.loads(row[0])):
+            path = [back(tuple(cell)) for cell in path]
+            if path[0] != board.pairs[number][0]:
+                path.reverse()
+            paths[number] = path
+        return paths
+
+    def put(self, board, paths):
+        # Guarda la solución 'paths' ({número: camino}) del tablero
+        form, symmetry, order = canonical_form(board.rows, board.cols, board.pairs)
+        transform = SYMMETRIES[symmetry][0]
+        stored = []
+        for (first, _), number in zip(form[1], order):
+            path = [transform(r, c, board.rows, board.cols) for r, c in paths[number]]
+            if path[0] != first:
+                path.reverse()
+            stored.append(path)
+        rows, cols = form[0]
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                             (_digest(form), rows, cols, json.dumps(stored)))
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def solve_cached(board, cache, solver=solve_bounded, **options):
+    """
+    Como solver.solve_bounded (u otro 'solver' que devuelva un SolveResult,
+    como los de batch.ENGINES), pero consultando antes la caché y guardando
+    en ella las soluciones nuevas. Si la solución sale de la caché devuelve
+    un SolveResult "solved" con cached=True. Con cache=None solo llama a
+    'solver'. Deja la solución (o la mejor parcial) en board.paths.
+    """
+    start = time.perf_counter()
+    if cache is not None:
+        paths = cache.get(board)
+        if paths is not None:
+            board.set_paths(paths)
+            return SolveResult("solved", paths, paths, board.size,
+                               time.perf_counter() - start, SearchStats(), cached=True)
+    result = solver(board, **options)
+    if cache is not None and result.paths is not None:
+        cache.put(board, result.paths)
+    return result
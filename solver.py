@@ -0,0 +1,781 @@
+# solver.py
+#
+# Motor de resolución sin dependencias gráficas: no importa pygame, de modo que
+# puede ejecutarse en procesos sin pantalla. La interfaz se engancha mediante
+# un callback de progreso opcional.
+import heapq
+import time
+from itertools import islice
+
+from board import is_game_completed
+from pruning import DeadEndChecker
+from transposition import TranspositionTable
+
+
+def _as_mask(board, occupied):
+    # Acepta tanto un conjunto de (r, c) como una máscara de bits
+    if isinstance(occupied, int):
+        return occupied
+    return board.mask_of(occupied)
+
+
+def has_dead_end(board, occupied):
+    # Una celda libre sin ningún vecino libre es un callejón sin salida
+    free = board.free_mask(_as_mask(board, occupied))
+    return bool(free & ~board.expand(free))
+
+
+def iter_paths(start, goal, occupied, board, cancel=None):
+    """
+    Genera perezosamente los caminos de start a goal que no pisan 'occupied' ni
+    los números de otros pares, en el mismo orden A* que a_star_all_paths
+    (longitud recorrida + distancia Manhattan a goal).
+
+    Cada nodo de la cola guarda solo su celda, un puntero a su padre y la máscara
+    de celdas visitadas, así que los prefijos se comparten y comprobar si una
+    celda ya está en el camino es O(1). El camino completo solo se construye al
+    devolverlo.
+
+    En tableros grandes puede pasar mucho tiempo entre un camino y el siguiente;
+    si se pasa cancel, se consulta cada pocos miles de nodos y se lanza
+    SearchCancelled al activarse.
+    """
+    cols = board.cols
+    neighbors = board.neighbors
+    gr, gc = goal
+    start_index = board.index(*start)
+    goal_index = board.index(gr, gc)
+    # Extremos de otros pares y celdas ocupadas, salvo la meta
+    blocked = (_as_mask(board, occupied) | board.endpoint_mask) & ~(1 << goal_index)
+
+    counter = 0  # desempate estable entre prioridades iguales
+    pq = [(0, counter, (start_index, None, 1 << start_index, 1))]  # nodo: (celda, padre, visitadas, longitud)
+    popped = 0
+    while pq:
+        _, _, node = heapq.heappop(pq)
+        index, _, visited, length = node
+        popped += 1
+        if cancel is not None and not popped & 1023 and cancel.is_set():
+            raise SearchCancelled()
+        if index == goal_index:
+            path = []
+            while node is not None:
+                path.append(divmod(node[0], cols))
+                node = node[1]
+            path.reverse()
+            yield path
+            continue
+        for neigh in neighbors[index]:
+            bit = 1 << neigh
+            if (blocked | visited) & bit:
+                continue
+            nr, nc = divmod(neigh, cols)
+            # Calculate priority using Manhattan distance
+            priority = length + abs(nr - gr) + abs(nc - gc)
+            counter += 1
+            heapq.heappush(pq, (priority, counter, (neigh, node, visited | bit, length + 1)))
+
+
+def a_star_all_paths(start, goal, occupied, board, max_paths=2000):
+    # Versión materializada de iter_paths, limitada a max_paths caminos
+    return list(islice(iter_paths(start, goal, occupied, board), max_paths))
+
+
+def order_pairs(board):
+    # Ordena los pares por distancia Manhattan entre sus extremos
+    pairs_list = []
+    for number, positions in board.pairs.items():
+        (r1, c1), (r2, c2) = positions
+        dist = abs(r1 - r2) + abs(c1 - c2)
+        pairs_list.append((number, (r1, c1), (r2, c2), dist))
+    pairs_list.sort(key=lambda x: x[3])
+    return [(num, start, goal) for (num, start, goal, _) in pairs_list]
+
+
+class SearchCancelled(Exception):
+    # args[0], si lo hay, indica el motivo: "budget" si se agotó el presupuesto
+    pass
+
+
+class _Deadline:
+    """
+    Se comporta como un threading.Event que se activa solo al llegar la hora
+    'deadline' (de time.perf_counter) o al activarse 'cancel'. Así todos los
+    puntos de la búsqueda que consultan cancel respetan también el plazo.
+    """
+
+    def __init__(self, cancel, deadline):
+        self.cancel = cancel
+        self.deadline = deadline
+
+    def is_set(self):
+        return ((self.cancel is not None and self.cancel.is_set())
+                or time.perf_counter() >= self.deadline)
+
+
+class SearchStats:
+    # Contadores de la búsqueda, para comparar estrategias
+    def __init__(self):
+        self.nodes = 0  # estados visitados
+        self.paths = 0  # caminos probados
+        self.placements = 0  # caminos aceptados por la poda
+        self.pruned = 0  # caminos descartados por la poda
+        self.backtracks = 0  # colocaciones deshechas tras fallar el subárbol
+        self.dead_pairs = 0  # estados descartados por un par sin rutas
+        self.cache_hits = 0  # estados descartados por la tabla de transposición
+        self.forced_cells = 0  # celdas fijadas por propagación
+        self.truncated = 0  # listas de candidatos cortadas por max_paths
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class Search:
+    """
+    Estado de la búsqueda A* + backtracking sobre un tablero: celdas ocupadas
+    (máscara de bits), detector incremental de callejones y pares pendientes en
+    el orden en que se intentan.
+
+    Con propagate=True, antes y durante la búsqueda se aplican los movimientos
+    forzados: cada par pendiente crece desde sus dos extremos ("cabezas") y los
+    pares de remaining son (número, cabeza_a, cabeza_b). Todos los cambios se
+    anotan en un registro (trail) y undo() deshace hasta la última colocación.
+    """
+
+    def __init__(self, board, max_paths=2000, progress=None, progress_interval=0.0, cancel=None,
+                 order="mrv", stats=None, table=None, propagate=True, deadline=None,
+                 node_budget=None, track_best=False, analysis="bitboard"):
+        if analysis not in ("bitboard", "numpy"):
+            raise ValueError(f"analysis desconocido: {analysis!r} (se esperaba 'bitboard' o 'numpy')")
+        self.board = board
+        self.max_paths = max_paths
+        self.order = order  # "mrv": par más restringido en cada nodo; "static": por distancia
+        self.stats = stats if stats is not None else SearchStats()
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.cancel = cancel  # cualquier objeto con is_set(), p. ej. threading.Event
+        if deadline is not None:
+            self.cancel = _Deadline(cancel, deadline)
+        # Presupuesto de trabajo desde ahora, en nodos visitados más caminos probados
+        # (cada camino probado cuesta una propagación y una poda aunque se descarte)
+        self._work_limit = None
+        if node_budget is not None:
+            self._work_limit = self.stats.nodes + self.stats.paths + node_budget
+        # Mejor solución parcial vista: ((pares unidos, celdas llenas), caminos)
+        self.track_best = track_best
+        self.best = None
+        self.propagate = propagate
+        self._last_report = 0.0
+
+        board.clear_paths()
+        self.occupied = board.endpoint_mask
+        self.checker = DeadEndChecker(board, self.occupied)
+        # analysis="numpy" comprueba las regiones con region_analysis (vectorizado);
+        # se importa aquí para no cargar NumPy en cada arranque del solucionador
+        self.regions = None
+        if analysis == "numpy":
+            from region_analysis import RegionAnalyzer
+            self.regions = RegionAnalyzer(board)
+        self.remaining = order_pairs(board)
+        # Cadenas ya fijadas desde cada extremo; la última celda es la cabeza
+        self.chains = {number: ([start], [goal]) for number, start, goal in self.remaining}
+        self._trail = []  # cambios aplicados, para deshacerlos en orden inverso
+        self._marks = []  # longitud del trail antes de cada colocación
+
+        # Estados sin solución ya explorados (ver state_key)
+        self.table = table if table is not None else TranspositionTable()
+
+        # Propagación inicial: lo que fije queda como base de toda la búsqueda
+        self.failed = not self._propagate() or not self._consistent()
+        self.root_forced = self.stats.forced_cells
+
+    def candidates(self, pair):
+        number, start, goal = pair
+        paths = iter_paths(start, goal, self.occupied, self.board, self.cancel)
+        if self.max_paths is None:
+            return paths
+        return self._limited(paths)
+
+    def _limited(self, paths):
+        # Los primeros max_paths caminos; si quedaban más, lo anota en stats.truncated
+        yield from islice(paths, self.max_paths)
+        if next(paths, None) is not None:
+            self.stats.truncated += 1
+
+    def choose(self):
+        """
+        Elige el siguiente par a colocar y devuelve (par, caminos candidatos), o
+        (None, None) si algún par pendiente se ha quedado sin salida.
+
+        Con order="mrv" se elige el par más restringido: el que tiene un extremo
+        con menos salidas libres (1 = movimiento forzado), luego menos salidas
+        en total y luego menor distancia.
+        """
+        if self.order == "static":
+            pair = self.remaining[0]
+            return pair, self.candidates(pair)
+
+        board = self.board
+        free = self.checker.free
+        neighbor_masks = board.neighbor_masks
+        best = None
+        for pair in self.remaining:
+            _, start, goal = pair
+            start_index = board.index(*start)
+            goal_index = board.index(*goal)
+            # El otro extremo también cuenta como salida si es adyacente
+            target = free | 1 << goal_index
+            exits_start = bin(neighbor_masks[start_index] & target).count("1")
+            target = free | 1 << start_index
+            exits_goal = bin(neighbor_masks[goal_index] & target).count("1")
+            fewest = min(exits_start, exits_goal)
+            if fewest == 0:
+                self.stats.dead_pairs += 1
+                return None, None
+            (r1, c1), (r2, c2) = start, goal
+            key = (fewest, exits_start + exits_goal, abs(r1 - r2) + abs(c1 - c2))
+            if best is None or key < best[0]:
+                best = (key, pair)
+        pair = best[1]
+        return pair, self.candidates(pair)
+
+    def _occupy(self, mask):
+        self.occupied |= mask
+        self.checker.occupy(mask)
+
+    def _release(self, mask):
+        self.occupied &= ~mask
+        self.checker.release(mask)
+
+    def _connect(self, pos, middle):
+        # Cierra el par remaining[pos] con 'middle', que va de cabeza a cabeza
+        board = self.board
+        pair = self.remaining.pop(pos)
+        chain_a, chain_b = self.chains[pair[0]]
+        new_cells = board.mask_of(middle) & ~self.occupied
+        self._occupy(new_cells)
+        board.set_path(pair[0], chain_a[:-1] + middle + chain_b[-2::-1])
+        self._trail.append(("connect", pos, pair, new_cells))
+
+    def _extend(self, pos, end, index):
+        # Alarga una de las dos cadenas del par remaining[pos] hasta la celda 'index'
+        number, start, goal = pair = self.remaining[pos]
+        cell = self.board.position(index)
+        self.chains[number][end].append(cell)
+        self.remaining[pos] = (number, cell, goal) if end == 0 else (number, start, cell)
+        self._occupy(1 << index)
+        self._trail.append(("extend", pos, pair, end, 1 << index))
+        self.stats.forced_cells += 1
+
+    def _rollback(self, mark):
+        trail = self._trail
+        while len(trail) > mark:
+            entry = trail.pop()
+            if entry[0] == "extend":
+                _, pos, pair, end, bit = entry
+                self.remaining[pos] = pair
+                self.chains[pair[0]][end].pop()
+                self._release(bit)
+            else:
+                _, pos, pair, new_cells = entry
+                self.remaining.insert(pos, pair)
+                self.board.remove_path(pair[0])
+                self._release(new_cells)
+
+    def _propagate(self):
+        """
+        Aplica movimientos forzados hasta que no quede ninguno:
+          - una cabeza con una sola salida libre (y sin su pareja al lado)
+            avanza por ella; sin salidas, solo puede unirse a su pareja;
+          - una celda libre con solo dos opciones (vecinos libres o cabezas),
+            una de ellas cabeza, pertenece a ese par: es un pasillo o esquina.
+        Devuelve False si encuentra una contradicción.
+        """
+        if not self.propagate:
+            return True
+        board = self.board
+        neighbor_masks = board.neighbor_masks
+        changed = True
+        while changed:
+            changed = False
+            free = self.checker.free
+            heads = {}  # índice de cabeza -> (posición en remaining, extremo)
+            for pos, (number, start, goal) in enumerate(self.remaining):
+                a, b = board.index(*start), board.index(*goal)
+                adjacent = neighbor_masks[a] >> b & 1
+                for end, head in ((0, a), (1, b)):
+                    exits = neighbor_masks[head] & free
+                    if exits == 0:
+                        if not adjacent:
+                            return False
+                        self._connect(pos, [start, goal])
+                        changed = True
+                    elif exits & (exits - 1) == 0 and not adjacent:
+                        self._extend(pos, end, exits.bit_length() - 1)
+                        changed = True
+                    if changed:
+                        break
+                if changed:
+                    break
+                heads[a] = (pos, 0)
+                heads[b] = (pos, 1)
+            if changed:
+                continue
+
+            heads_mask = 0
+            for index in heads:
+                heads_mask |= 1 << index
+            options = free | heads_mask
+            left, right, up, down = board.neighbor_planes(options)
+            at_least_3 = (left & right & (up | down)) | (up & down & (left | right))
+            candidates = free & ~at_least_3 & board.expand(heads_mask)
+            while candidates:
+                low = candidates & -candidates
+                candidates ^= low
+                index = low.bit_length() - 1
+                around = neighbor_masks[index] & options
+                if around & (around - 1) == 0:
+                    return False  # celda libre con menos de dos opciones
+                if bin(around).count("1") > 2:
+                    continue
+                near = around & heads_mask
+                first = near & -near
+                owner = heads[first.bit_length() - 1]
+                if near != first:
+                    other = heads[(near ^ first).bit_length() - 1]
+                    if other[0] != owner[0]:
+                        return False  # quedaría entre cabezas de dos pares
+                    number, start, goal = self.remaining[owner[0]]
+                    self._connect(owner[0], [start, board.position(index), goal])
+                    self.stats.forced_cells += 1
+                else:
+                    self._extend(owner[0], owner[1], index)
+                changed = True
+                break
+        return True
+
+    def _stranded(self):
+        if self.regions is not None:
+            return self.regions.is_stranded(self.checker.free, self.remaining)
+        return self.checker.is_stranded(self.remaining)
+
+    def _consistent(self):
+        return not (self.checker.has_dead_end(self.remaining) or self._stranded())
+
+    def place(self, number, path):
+        """
+        Coloca el camino del número indicado (de una cabeza a la otra) y propaga
+        los movimientos forzados. Si la poda descarta el estado resultante lo
+        deshace y devuelve False.
+        """
+        mark = len(self._trail)
+        pos = next(i for i, pair in enumerate(self.remaining) if pair[0] == number)
+        self._connect(pos, path)
+        if not self._propagate() or not self._consistent():
+            self._rollback(mark)
+            self.stats.pruned += 1
+            return False
+        self._marks.append(mark)
+        self.stats.placements += 1
+        return True
+
+    def undo(self):
+        # Deshace la última colocación y todo lo que propagó
+        self._rollback(self._marks.pop())
+
+    def state_key(self):
+        # Celdas ocupadas más las cabezas de cada par pendiente
+        return self.occupied, tuple(sorted(self.remaining))
+
+    def _note_best(self):
+        # Los caminos de board.paths no se modifican en su sitio: basta copiar el dict
+        board = self.board
+        score = (len(board.paths), board.filled)
+        if self.best is None or score > self.best[0]:
+            self.best = (score, dict(board.paths))
+
+    def _report(self):
+        now = time.perf_counter()
+        if now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.progress(self.board)
+
+    def _visit(self):
+        # Cuenta un nodo nuevo y comprueba si hay que parar
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled()
+        stats = self.stats
+        stats.nodes += 1
+        if self.track_best:
+            self._note_best()
+        self._check_budget()
+
+    def _check_budget(self):
+        stats = self.stats
+        if self._work_limit is not None and stats.nodes + stats.paths > self._work_limit:
+            raise SearchCancelled("budget")
+
+    def _open(self):
+        """
+        Abre el nodo del estado actual. Devuelve True si es una solución, False
+        si no tiene salida (hoja incompleta, estado ya fallido o par bloqueado)
+        o el marco [clave, número, caminos, cortes] con el que seguir
+        explorándolo; 'cortes' es stats.truncated al abrirlo.
+        """
+        self._visit()
+        if not self.remaining:
+            return is_game_completed(self.board)
+        key = self.state_key()
+        if self.table.lookup(key) is not None:
+            self.stats.cache_hits += 1
+            return False
+        pair, paths = self.choose()
+        if pair is None:
+            self.table.store(key)
+            return False
+        return [key, pair[0], paths, self.stats.truncated]
+
+    def _place_next(self, number, paths):
+        # Coloca el siguiente camino de 'paths' que acepte la poda; False si no quedan
+        stats = self.stats
+        for path in paths:
+            stats.paths += 1
+            self._check_budget()
+            if self.place(number, path):
+                return True
+            # Un par puede descartar miles de caminos seguidos sin abrir nodos
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchCancelled()
+        return False
+
+    def _search(self):
+        """
+        Búsqueda en profundidad con una pila explícita en lugar de recursión:
+        cada marco guarda la clave del estado, el par elegido y el iterador
+        perezoso de sus caminos. Las colocaciones se deshacen con el registro
+        (undo), así que la memoria crece solo con la profundidad actual y no hay
+        límite de recursión de Python.
+        """
+        stats = self.stats
+        node = self._open()
+        if node is True or node is False:
+            return node
+        stack = [node]
+        while stack:
+            key, number, paths, truncated = stack[-1]
+            if not self._place_next(number, paths):
+                # Sin más caminos. Solo está probado que el estado no tiene
+                # solución si max_paths no ha cortado ninguna lista de su subárbol
+                stack.pop()
+                if stats.truncated == truncated:
+                    self.table.store(key)
+                if stack:
+                    self.undo()
+                    stats.backtracks += 1
+                continue
+
+            if self.progress is not None:
+                self._report()
+
+            child = self._open()
+            if child is True:
+                return True
+            if child is False:
+                self.undo()
+                stats.backtracks += 1
+            else:
+                stack.append(child)
+        return False
+
+    def run(self):
+        """
+        Completa la búsqueda desde el estado actual. Devuelve los caminos o None;
+        lanza SearchCancelled si se activa 'cancel'.
+        """
+        if not self.failed and self._search():
+            return dict(self.board.paths)
+        return None
+
+    def count(self, limit=2):
+        """
+        Cuenta las soluciones desde el estado actual hasta un máximo de 'limit'
+        (con 2 basta para saber si es única). Usa la misma poda y propagación que
+        run(); la tabla guarda el número exacto de soluciones de cada estado
+        explorado por completo, así que los subárboles repetidos no se recorren
+        dos veces. Para contar bien hay que crear la búsqueda con max_paths=None.
+        Lanza SearchCancelled si se activa 'cancel'.
+        """
+        if self.failed:
+            return 0
+        return self._count(limit)
+
+    def _open_count(self, limit):
+        # Como _open, pero devuelve el recuento de los nodos que no hay que
+        # explorar o el marco [clave, número, caminos, total, límite, cortes]
+        self._visit()
+        if not self.remaining:
+            return 1 if is_game_completed(self.board) else 0
+        key = self.state_key()
+        cached = self.table.lookup(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return min(cached, limit)
+        pair, paths = self.choose()
+        if pair is None:
+            self.table.store(key, 0)
+            return 0
+        return [key, pair[0], paths, 0, limit, self.stats.truncated]
+
+    def _count(self, limit):
+        # Misma pila explícita que _search; 'value' es el recuento del último
+        # subárbol terminado, que se suma al marco de arriba
+        stats = self.stats
+        value = self._open_count(limit)
+        if not isinstance(value, list):
+            return value
+        stack = [value]
+        value = None
+        while stack:
+            frame = stack[-1]
+            if value is not None:
+                self.undo()
+                stats.backtracks += 1
+                frame[3] += value
+                value = None
+                if frame[3] >= frame[4]:
+                    stack.pop()
+                    value = frame[3]  # recuento parcial: no se guarda
+                    continue
+            if not self._place_next(frame[1], frame[2]):
+                stack.pop()
+                if stats.truncated == frame[5]:  # recuento exacto
+                    self.table.store(frame[0], frame[3])
+                value = frame[3]
+                continue
+            child = self._open_count(frame[4] - frame[3])
+            if isinstance(child, list):
+                stack.append(child)
+            else:
+                value = child
+        return value
+
+
+class TracedSearch(Search):
+    """
+    Search que además informa a un instrumentation.Tracer: nodos, caminos,
+    podas y retrocesos por profundidad, caminos por par, motivo de cada poda y
+    tiempo por fase ("choose", "enumerate", "propagate", "prune", "render").
+    Es una subclase para que la búsqueda normal no pague nada por las trazas.
+    """
+
+    def __init__(self, board, *args, tracer, **kwargs):
+        self.tracer = tracer
+        super().__init__(board, *args, **kwargs)
+
+    def candidates(self, pair):
+        paths = self.tracer.timed("enumerate", super().candidates(pair))
+        for path in paths:
+            self.tracer.pair_paths[pair[0]] += 1
+            yield path
+
+    def choose(self):
+        with self.tracer.phase("choose"):
+            return super().choose()
+
+    def _propagate(self):
+        with self.tracer.phase("propagate"):
+            if super()._propagate():
+                return True
+            self.tracer.count("contradiction")
+            return False
+
+    def _consistent(self):
+        with self.tracer.phase("prune"):
+            if self.checker.has_dead_end(self.remaining):
+                self.tracer.count("dead_end")
+                return False
+            if self._stranded():
+                self.tracer.count("stranded")
+                return False
+            return True
+
+    def place(self, number, path):
+        depth = len(self._marks)
+        self.tracer.at_depth("paths", depth)
+        if super().place(number, path):
+            return True
+        self.tracer.at_depth("pruned", depth)
+        return False
+
+    def undo(self):
+        super().undo()
+        self.tracer.at_depth("backtracks", len(self._marks))
+
+    def _report(self):
+        with self.tracer.phase("render"):
+            super()._report()
+
+    def _visit(self):
+        self.tracer.at_depth("nodes", len(self._marks))
+        super()._visit()
+
+
+def solve(board, progress=None, progress_interval=0.0, max_paths=2000, cancel=None,
+          order="mrv", stats=None, table=None, propagate=True, tracer=None, analysis="bitboard"):
+    """
+    Resuelve el tablero con A* + backtracking, sin dibujar nada.
+
+    Devuelve un diccionario {número: camino} con la solución, o None si no la
+    encuentra. Al terminar, board.paths contiene la solución (o queda vacío).
+
+    progress, si se indica, se llama como progress(board) tras cada colocación
+    aceptada, como mucho una vez cada progress_interval segundos; la interfaz
+    lo usa para animar la búsqueda sin frenarla.
+
+    max_paths limita cuántos caminos se prueban por par en cada nivel. Si cancel
+    (p. ej. un threading.Event) se activa, la búsqueda se abandona y devuelve None.
+
+    order elige el siguiente par: "mrv" (el más restringido en cada nodo) o
+    "static" (por distancia Manhattan, fijo). Si se pasa un SearchStats en
+    stats, queda con los contadores de la búsqueda.
+
+    table es la transposition.TranspositionTable de estados sin solución; por
+    defecto se crea una de 100000 entradas (max_entries=0 la desactiva).
+
+    propagate aplica los movimientos forzados antes y durante la búsqueda; las
+    celdas que fija se cuentan en stats.forced_cells.
+
+    tracer, un instrumentation.Tracer, recoge histogramas por profundidad y
+    tiempos por fase (ver TracedSearch). Sin él la búsqueda no se instrumenta.
+
+    analysis elige cómo se analizan las regiones libres al podar: "bitboard"
+    (relleno por bits) o "numpy" (region_analysis, vectorizado; necesita
+    NumPy). Medido por comprobación, el de bits es más rápido hasta 25x25,
+    empatan hacia 30x30 y el de NumPy gana desde unos 40x40 (0,7 veces el
+    tiempo en 50x50). Otro valor lanza ValueError.
+    """
+    if tracer is None:
+        search = Search(board, max_paths, progress, progress_interval, cancel, order, stats,
+                        table, propagate, analysis=analysis)
+    else:
+        search = TracedSearch(board, max_paths, progress, progress_interval, cancel, order,
+                              stats, table, propagate, tracer=tracer, analysis=analysis)
+    try:
+        paths = search.run()
+    except SearchCancelled:
+        paths = None
+    if paths is None:
+        board.clear_paths()
+    return paths
+
+
+def count_solutions(board, limit=2, cancel=None, order="mrv", stats=None, table=None,
+                    propagate=True, analysis="bitboard"):
+    """
+    Número de soluciones del tablero, contando como mucho hasta 'limit'
+    (count_solutions(board) == 1 significa solución única). Devuelve None si se
+    cancela. Enumera todos los caminos de cada par (max_paths=None), así que el
+    recuento es exacto.
+
+    table guarda recuentos por estado, no estados sin solución: no se debe
+    compartir con solve(). Por defecto se crea una nueva.
+    """
+    search = Search(board, None, cancel=cancel, order=order, stats=stats, table=table,
+                    propagate=propagate, analysis=analysis)
+    try:
+        return search.count(limit)
+    except SearchCancelled:
+        return None
+    finally:
+        board.clear_paths()
+
+
+class SolveResult:
+    """
+    Resultado de solve_bounded. status es "solved", "unsolvable" (búsqueda
+    agotada sin solución), "incomplete" (búsqueda agotada sin solución, pero
+    max_paths dejó caminos sin probar), "timeout", "budget" (presupuesto
+    agotado) o "cancelled".
+    paths es la solución o None; best, la mejor solución parcial encontrada
+    (más pares unidos y, a igualdad, más celdas llenas), que con status
+    "solved" es la propia solución. cached indica que la solución salió de
+    una solution_cache.SolutionCache sin buscar.
+    """
+
+    def __init__(self, status, paths, best, best_filled, elapsed, stats, cached=False):
+        self.status = status
+        self.paths = paths
+        self.best = best
+        self.best_filled = best_filled
+        self.elapsed = elapsed
+        self.stats = stats
+        self.cached = cached
+
+    @property
+    def solved(self):
+        return self.status == "solved"
+
+    def as_dict(self):
+        return {
+            "status": self.status,
+            "elapsed": round(self.elapsed, 6),
+            "best_pairs": len(self.best),
+            "best_filled": self.best_filled,
+            "cached": self.cached,
+            "stats": self.stats.as_dict(),
+        }
+
+
+def solve_bounded(board, timeout=None, node_budget=None, cancel=None, deadline=None,
+                  progress=None, progress_interval=0.0, max_paths=None, order="mrv", stats=None,
+                  table=None, propagate=True, tracer=None, analysis="bitboard"):
+    """
+    Como solve, pero con límites y devolviendo un SolveResult:
+      - timeout: segundos desde ahora, o deadline: instante de time.perf_counter;
+      - node_budget: presupuesto de trabajo, en nodos visitados más caminos
+        probados (stats.nodes + stats.paths); cada camino probado cuenta aunque
+        la poda lo descarte, así que el límite acota también el tiempo;
+      - cancel: objeto con is_set() (p. ej. threading.Event) que otro hilo
+        puede activar para abandonar la búsqueda.
+    Como el trabajo ya lo acotan esos límites, por defecto no se limitan los
+    caminos por par (max_paths=None) y "unsolvable" es una prueba de que no
+    hay solución; con max_paths, si se corta alguna lista de candidatos y la
+    búsqueda se agota, el estado es "incomplete".
+    El plazo se comprueba también mientras se enumeran caminos, así que se
+    respeta con una precisión de milisegundos. Al terminar, board.paths
+    contiene la solución o, si no la hay, la mejor solución parcial.
+    """
+    start = time.perf_counter()
+    if timeout is not None:
+        deadline = start + timeout if deadline is None else min(deadline, start + timeout)
+    stats = stats if stats is not None else SearchStats()
+    truncated = stats.truncated
+    options = dict(cancel=cancel, order=order, stats=stats, table=table, propagate=propagate,
+                   deadline=deadline, node_budget=node_budget, track_best=True,
+                   analysis=analysis)
+    if tracer is None:
+        search = Search(board, max_paths, progress, progress_interval, **options)
+    else:
+        search = TracedSearch(board, max_paths, progress, progress_interval, tracer=tracer,
+                              **options)
+    search._note_best()  # el estado tras la propagación inicial ya cuenta
+    try:
+        paths = search.run()
+        if paths is not None:
+            status = "solved"
+        else:
+            status = "unsolvable" if stats.truncated == truncated else "incomplete"
+    except SearchCancelled as exc:
+        paths = None
+        if exc.args and exc.args[0] == "budget":
+            status = "budget"
+        elif cancel is not None and cancel.is_set():
+            status = "cancelled"
+        else:
+            status = "timeout"
+    if paths is not None:
+        best, filled = paths, board.size
+    else:
+        (_, filled), best = search.best
+        board.set_paths(best)
+    return SolveResult(status, paths, best, filled, time.perf_counter() - start, stats)
@@ -1,26 +1,53 @@
 # test_main.py
 
 import unittest
-import pygame  # Solo para inicializar fonts si fuera necesario
 import sys
+import gzip
+import io
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
 
 # Importamos las funciones y clases que vamos a probar
 from main import get_cell_from_mouse, has_dead_end, a_star_all_paths
-from board import Board
+from board import Board, is_game_completed
+from board_parser import read_board_file, iter_boards, format_board, BoardFormatError
+from puzzle_pack import write_pack, PuzzlePack
+from solver import solve, iter_paths, Search, SearchStats, count_solutions, solve_bounded
+from pruning import DeadEndChecker
+from region_analysis import RegionAnalyzer, HAVE_NUMPY
+from sat_solver import solve_sat
+from batch import collect_files, run_batch, solve_file
+import parallel
+from parallel import iter_subtrees, solve_parallel
+from transposition import TranspositionTable
+from generator import generate_puzzle, random_hamiltonian_path, split_path
+from instrumentation import Tracer, profile_call
+from runner import SearchRunner
+from solution_cache import SolutionCache, fingerprint, solve_cached
+from benchmark import build_suite, run_puzzle, summarize, compare
 
 # Importamos constantes de UI para get_cell_from_mouse
-from ui import MARGIN, CELL_SIZE
+from ui import MARGIN, CELL_SIZE, FONT_SIZE, BoardRenderer
 
 
 class TestMainFunctions(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Algunas funciones no necesitan Pygame, pero dejamos esto por si en el futuro fuese necesario.
-        pygame.init()
-
-    @classmethod
-    def tearDownClass(cls):
-        pygame.quit()
+    def test_import_without_pygame(self):
+        """
+        main (y con él ui, el solucionador y la caché) se importa en un proceso
+        aparte donde pygame no se puede importar: solo lo cargan las funciones
+        de la interfaz.
+        """
+        code = "import sys; sys.modules['pygame'] = None; import main; print(main.get_cell_from_mouse((20, 20)))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        print(f"import main sin pygame Salida: {result.stdout.strip() or result.stderr}")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "(0, 0)")
 
     def test_get_cell_from_mouse(self):
         """
@@ -153,6 +180,607 @@ class TestMainFunctions(unittest.TestCase):
         # Al menos hay una ruta válida (la que da la vuelta al obstáculo)
         self.assertTrue(len(paths) >= 1)
 
+    def test_iter_paths_lazy(self):
+        """
+        Tablero 3x3 sin pares, de (0,0) a (0,2). iter_paths es un generador: el primer
+        camino que devuelve es el más corto, y los siguientes nunca repiten celdas.
+        """
+        board = Board(3, 3, {})
+        paths = iter_paths((0, 0), (0, 2), set(), board)
+        first = next(paths)
+        print(f"iter_paths Entrada: start=(0, 0), goal=(0, 2) → Primer camino: {first}")
+        self.assertEqual(first, [(0, 0), (0, 1), (0, 2)])
+        for path in paths:
+            self.assertEqual(len(path), len(set(path)))
+            self.assertEqual((path[0], path[-1]), ((0, 0), (0, 2)))
+
+    def test_board_bitboards(self):
+        """
+        Tablero 3x3: comprobamos la conversión celdas <-> máscara y que expand()
+        devuelve los vecinos ortogonales sin saltar de una fila a otra.
+        """
+        board = Board(3, 3, {1: [(0, 0), (2, 2)]})
+        self.assertEqual(board.endpoint_mask, board.mask_of([(0, 0), (2, 2)]))
+        self.assertEqual(board.cells_of(board.mask_of([(1, 2), (0, 1)])), [(0, 1), (1, 2)])
+        # Vecinos de (0, 2): (0, 1) y (1, 2), nunca (1, 0)
+        output = board.cells_of(board.expand(board.bit(0, 2)))
+        print(f"expand Entrada: (0, 2) → Salida: {output}")
+        self.assertEqual(output, [(0, 1), (1, 2)])
+        self.assertEqual(board.expand(board.bit(1, 1)), board.neighbor_masks[board.index(1, 1)])
+        self.assertEqual(board.free_mask(board.bit(1, 1)), board.full_mask & ~board.mask_of([(0, 0), (2, 2), (1, 1)]))
+
+    def test_board_occupancy_index(self):
+        """
+        Tablero 2x3 con pares 1: (0,0)-(0,2) y 2: (1,0)-(1,2). El índice de
+        ocupación sigue a add_to_path, remove_last_from_path y set_path: una celda
+        de un camino deja de ser un movimiento válido, y el tablero se completa
+        cuando filled llega a rows * cols.
+        """
+        board = Board(2, 3, {1: [(0, 0), (0, 2)], 2: [(1, 0), (1, 2)]})
+        self.assertEqual(board.filled, 4)
+        board.set_path(1, [(0, 0)])
+        board.add_to_path(1, (0, 1))
+        self.assertEqual(board.owner(0, 1), 1)
+        self.assertEqual(board.filled, 5)
+        self.assertFalse(board.is_valid_move(0, 1, 1, 1, 2))
+        board.remove_last_from_path(1)
+        self.assertIsNone(board.owner(0, 1))
+        self.assertTrue(board.is_valid_move(0, 1, 1, 1, 2))
+
+        board.set_path(1, [(0, 0), (0, 1), (0, 2)])
+        self.assertFalse(is_game_completed(board))
+        board.set_path(2, [(1, 0), (1, 1), (1, 2)])
+        print(f"filled Entrada: 2x3 con dos caminos → Salida: {board.filled}")
+        self.assertEqual(board.filled, 6)
+        self.assertTrue(is_game_completed(board))
+
+        board.set_path(2, [(1, 0)])  # reiniciar un camino libera sus celdas
+        self.assertEqual(board.filled, 5)
+        self.assertIsNone(board.owner(1, 1))
+        self.assertFalse(is_game_completed(board))
+        board.clear_paths()
+        self.assertEqual((board.filled, board.paths), (4, {}))
+
+    def test_dead_end_checker_incremental(self):
+        """
+        Tablero 3x3 con un par en (0,0)-(2,2). Ocupamos celda a celda hasta dejar (1,1)
+        aislada y comprobamos que el contador incremental coincide con has_dead_end;
+        al liberar (0,1) y (1,0) todas las celdas libres vuelven a tener salida.
+        """
+        board = Board(3, 3, {1: [(0, 0), (2, 2)]})
+        occupied = board.endpoint_mask
+        checker = DeadEndChecker(board, occupied)
+        for cell in [(0, 1), (1, 0), (1, 2), (2, 1)]:
+            checker.occupy(board.bit(*cell))
+            occupied |= board.bit(*cell)
+            self.assertEqual(checker.has_dead_end(), has_dead_end(board, occupied))
+        self.assertTrue(checker.has_dead_end())
+        checker.release(board.mask_of([(0, 1), (1, 0)]))
+        self.assertFalse(checker.has_dead_end())
+
+    def test_dead_end_checker_stranded(self):
+        """
+        Tablero 1x5 con el par 1 en los extremos y el par 2 en (0,1)-(0,3): la celda (0,2)
+        solo puede rellenarla el par 2. Si el par 2 ya no está pendiente, la región queda
+        huérfana; y el par 1 nunca puede conectarse porque no toca ninguna región.
+        """
+        board = Board(1, 5, {1: [(0, 0), (0, 4)], 2: [(0, 1), (0, 3)]})
+        checker = DeadEndChecker(board, board.endpoint_mask)
+        self.assertFalse(checker.is_stranded([(2, (0, 1), (0, 3))]))
+        self.assertTrue(checker.is_stranded([]))
+        self.assertTrue(checker.is_stranded([(1, (0, 0), (0, 4)), (2, (0, 1), (0, 3))]))
+
+    def test_solve_headless(self):
+        """
+        Resolvemos exampleEZ.txt con el motor sin interfaz: debe devolver los caminos
+        y dejar el tablero completo.
+        """
+        board = Board(*read_board_file("exampleEZ.txt"))
+        paths = solve(board)
+        print(f"solve Entrada: exampleEZ.txt → Salida: {paths}")
+        self.assertIsNotNone(paths)
+        self.assertEqual(paths, board.paths)
+        self.assertTrue(is_game_completed(board))
+
+    def test_solve_mrv_stats(self):
+        """
+        Con el orden dinámico (mrv) y el estático se resuelve exampleEZ.txt; sin
+        propagación, en ambos casos las colocaciones que no se deshicieron son
+        exactamente una por par.
+        """
+        for order in ("mrv", "static"):
+            board = Board(*read_board_file("exampleEZ.txt"))
+            stats = SearchStats()
+            paths = solve(board, order=order, stats=stats, propagate=False)
+            print(f"solve Entrada: exampleEZ.txt, order={order} → Estadísticas: {stats.as_dict()}")
+            self.assertIsNotNone(paths)
+            self.assertEqual(stats.placements - stats.backtracks, len(board.pairs))
+            self.assertTrue(stats.nodes >= len(board.pairs))
+
+    def test_dead_end_checker_pending_pair(self):
+        """
+        Tablero 1x3 con el par en (0,0)-(0,2): la celda central no tiene vecinos libres,
+        pero toca los dos extremos del par pendiente, así que no es un callejón.
+        """
+        board = Board(1, 3, {1: [(0, 0), (0, 2)]})
+        checker = DeadEndChecker(board, board.endpoint_mask)
+        self.assertTrue(checker.has_dead_end())
+        self.assertFalse(checker.has_dead_end([(1, (0, 0), (0, 2))]))
+
+    def test_forced_moves(self):
+        """
+        Tablero 2x3 con el par 1 en (0,0)-(0,2) y el par 2 en (1,0)-(1,2). La celda (0,1)
+        solo tiene dos opciones y ambas son cabezas del par 1; lo mismo (1,1) con el par 2.
+        La propagación inicial resuelve el tablero sin probar caminos: fija 2 celdas.
+        """
+        board = Board(2, 3, {1: [(0, 0), (0, 2)], 2: [(1, 0), (1, 2)]})
+        stats = SearchStats()
+        paths = solve(board, stats=stats)
+        print(f"solve (propagación) Entrada: 2x3 → Salida: {paths}, {stats.as_dict()}")
+        self.assertEqual(paths, {1: [(0, 0), (0, 1), (0, 2)], 2: [(1, 0), (1, 1), (1, 2)]})
+        self.assertEqual(stats.forced_cells, 2)
+        self.assertEqual(stats.paths, 0)
+
+        # Pasillo: 1x4 con el par en (0,0)-(0,3); la cabeza avanza celda a celda
+        board = Board(1, 4, {1: [(0, 0), (0, 3)]})
+        stats = SearchStats()
+        search = Search(board, stats=stats)
+        self.assertEqual(search.root_forced, 2)
+        self.assertEqual(search.remaining, [])
+        self.assertEqual(board.paths[1], [(0, 0), (0, 1), (0, 2), (0, 3)])
+
+    def test_count_solutions(self):
+        """
+        Un 2x2 con un único par en (0,0)-(1,0) tiene una sola solución (rodeando
+        por la derecha). Un 3x3 con un par en esquinas opuestas tiene dos (las dos
+        serpientes), y con limit=1 la búsqueda para en la primera. Los recuentos
+        coinciden con el motor SAT al excluir la solución conocida.
+        """
+        self.assertEqual(count_solutions(Board(2, 2, {1: [(0, 0), (1, 0)]})), 1)
+        board = Board(3, 3, {1: [(0, 0), (2, 2)]})
+        stats = SearchStats()
+        output = count_solutions(board, limit=10, stats=stats)
+        print(f"count_solutions Entrada: 3x3 esquinas → Salida: {output}")
+        self.assertEqual(output, 2)
+        self.assertEqual(count_solutions(board, limit=1), 1)
+        self.assertEqual(board.paths, {})
+
+        rows, cols, pairs, solution = generate_puzzle(6, 6, seed=11)
+        self.assertEqual(count_solutions(Board(rows, cols, pairs)), 1)
+        rows, cols, pairs, solution = generate_puzzle(6, 6, seed=4, unique=False)
+        unique = solve_sat(Board(rows, cols, pairs), exclude=[solution]) is None
+        self.assertEqual(count_solutions(Board(rows, cols, pairs)) == 1, unique)
+
+    def test_solve_bounded(self):
+        """
+        solve_bounded devuelve un SolveResult: "solved" con la solución, "budget"
+        al agotar el presupuesto (nodos más caminos probados), "cancelled" si otro
+        hilo activa el evento, "unsolvable" si la búsqueda se agota e "incomplete" si
+        se agota tras cortar candidatos con max_paths. Si no
+        resuelve, board.paths queda con la mejor solución parcial. Sin propagación,
+        exampleEZ descarta 34 caminos en la raíz antes de colocar el primero: con
+        presupuesto 10 se para en la raíz sin probarlos todos.
+        """
+        result = solve_bounded(Board(*read_board_file("exampleEZ.txt")), timeout=30)
+        self.assertTrue(result.solved)
+        self.assertEqual(result.best, result.paths)
+
+        board = Board(*read_board_file("exampleEZ.txt"))
+        result = solve_bounded(board, node_budget=35, propagate=False)
+        print(f"solve_bounded Entrada: node_budget=35 → Salida: {result.as_dict()}")
+        self.assertEqual(result.status, "budget")
+        self.assertIsNone(result.paths)
+        self.assertEqual(board.paths, result.best)
+        self.assertEqual(len(result.best), 1)  # el primer camino colocado
+
+        stats = SearchStats()
+        result = solve_bounded(Board(*read_board_file("exampleEZ.txt")), node_budget=10,
+                               propagate=False, stats=stats)
+        self.assertEqual(result.status, "budget")
+        self.assertEqual((stats.nodes, stats.paths), (1, 10))
+
+        cancel = threading.Event()
+        cancel.set()
+        result = solve_bounded(Board(*read_board_file("exampleEZ.txt")), cancel=cancel)
+        self.assertEqual(result.status, "cancelled")
+        result = solve_bounded(Board(*read_board_file("exampleEZ.txt")), timeout=0)
+        self.assertEqual(result.status, "timeout")
+
+        board = Board(2, 2, {1: [(0, 0), (1, 1)], 2: [(0, 1), (1, 0)]})
+        self.assertEqual(solve_bounded(board).status, "unsolvable")
+
+        # Un solo par en la fila de abajo de un 5x5: el camino que llena el tablero
+        # está más allá de los 2000 primeros candidatos. Con max_paths la búsqueda
+        # se agota sin probarlo ("incomplete", no "unsolvable") y no guarda la raíz
+        # como estado sin solución; sin límite (por defecto) lo encuentra.
+        table = TranspositionTable()
+        board = Board(5, 5, {1: [(4, 0), (4, 4)]})
+        result = solve_bounded(board, max_paths=2000, table=table)
+        print(f"solve_bounded Entrada: 5x5, max_paths=2000 → Salida: {result.status}")
+        self.assertEqual(result.status, "incomplete")
+        self.assertGreater(result.stats.truncated, 0)
+        self.assertTrue(solve_bounded(board, table=table).solved)
+
+    def test_search_without_recursion(self):
+        """
+        Tablero 2x300 con 300 pares en vertical y sin propagación: la búsqueda
+        coloca los 300 caminos uno a uno (300 niveles) con un límite de recursión
+        de 150, porque usa una pila explícita.
+        """
+        board = Board(2, 300, {i + 1: [(0, i), (1, i)] for i in range(300)})
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(150)
+        try:
+            stats = SearchStats()
+            paths = solve(board, propagate=False, stats=stats)
+        finally:
+            sys.setrecursionlimit(limit)
+        print(f"solve Entrada: 2x300, 300 pares → Salida: {stats.nodes} nodos")
+        self.assertIsNotNone(paths)
+        self.assertEqual(stats.nodes, 301)
+        self.assertTrue(is_game_completed(board))
+
+    @unittest.skipUnless(HAVE_NUMPY, "necesita NumPy")
+    def test_region_analysis_numpy(self):
+        """
+        Con NumPy, las regiones etiquetadas coinciden con las de DeadEndChecker en un
+        tablero con una pared ocupada en medio, y solve con analysis="numpy" visita
+        los mismos nodos y da la misma solución que con el análisis por bits. Un valor
+        de analysis desconocido lanza ValueError.
+        """
+        board = Board(*read_board_file("example.txt"))
+        wall = board.mask_of([(r, 2) for r in range(board.rows)]) | board.endpoint_mask
+        checker = DeadEndChecker(board, wall)
+        labels = RegionAnalyzer(board).label(checker.free)
+        regions = {}
+        for index, label in enumerate(labels):
+            if label >= 0:
+                regions[label] = regions.get(label, 0) | 1 << index
+        self.assertEqual(sorted(regions.values()), sorted(checker.regions()))
+
+        bits, vectorized = SearchStats(), SearchStats()
+        expected = solve(board, stats=bits)
+        paths = solve(board, stats=vectorized, analysis="numpy")
+        print(f"solve Entrada: example.txt, analysis=numpy → Salida: {vectorized.nodes} nodos")
+        self.assertEqual(paths, expected)
+        self.assertEqual(vectorized.nodes, bits.nodes)
+        with self.assertRaisesRegex(ValueError, "nump"):
+            solve(board, analysis="nump")
+
+    def test_transposition_table_lru(self):
+        """
+        Tabla de 2 entradas: al consultar la clave 1 pasa a ser la más reciente, así que
+        al guardar la 3 se expulsa la 2. Se cuentan aciertos, fallos y expulsiones.
+        """
+        table = TranspositionTable(max_entries=2)
+        table.store(1)
+        table.store(2)
+        self.assertTrue(table.lookup(1))
+        table.store(3)
+        self.assertIsNone(table.lookup(2))
+        self.assertTrue(table.lookup(3))
+        print(f"TranspositionTable Salida: {table.as_dict()}")
+        self.assertEqual(table.as_dict(), {"entries": 2, "max_entries": 2, "hits": 2, "misses": 1, "evictions": 1})
+
+    def test_solve_sat(self):
+        """
+        El motor SAT (CDCL en Python) resuelve example.txt dejando el tablero completo,
+        y detecta que un tablero 1x3 con el par en (0,0)-(0,1) no tiene solución
+        porque la celda (0,2) no puede rellenarse.
+        """
+        board = Board(*read_board_file("example.txt"))
+        paths = solve_sat(board, backend="python")
+        print(f"solve_sat Entrada: example.txt → Salida: {paths}")
+        self.assertIsNotNone(paths)
+        self.assertTrue(is_game_completed(board))
+        for path in paths.values():
+            for (r1, c1), (r2, c2) in zip(path, path[1:]):
+                self.assertEqual(abs(r1 - r2) + abs(c1 - c2), 1)
+
+        board = Board(1, 3, {1: [(0, 0), (0, 1)]})
+        self.assertIsNone(solve_sat(board, backend="python"))
+
+    def test_batch_solve_file(self):
+        """
+        solve_file devuelve un registro serializable por tablero del archivo, con el
+        estado y los caminos; un archivo inexistente da un registro "error". En un
+        directorio, run_batch lee también los .txt.gz y resuelve cada tablero de un
+        archivo con varios, con su índice.
+        """
+        record, = solve_file("exampleEZ.txt", engine="search", timeout=30)
+        print(f"solve_file Entrada: exampleEZ.txt → Salida: {record['status']} en {record['time']} s")
+        self.assertEqual((record["status"], record["index"]), ("solved", 0))
+        self.assertEqual(len(record["paths"]), 5)
+        self.assertEqual([r["status"] for r in solve_file("no_existe.txt")], ["error"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = os.path.join(tmp, "corpus.txt.gz")
+            with gzip.open(corpus, "wt") as output:
+                output.write(format_board(*read_board_file("exampleEZ.txt"))
+                             + format_board(2, 2, {1: [(0, 0), (1, 1)], 2: [(0, 1), (1, 0)]}))
+            files = collect_files([tmp])
+            self.assertEqual(files, [corpus])
+            output = io.StringIO()
+            counts = run_batch(files, output, workers=2)
+            records = sorted((json.loads(line) for line in output.getvalue().splitlines()),
+                             key=lambda r: r["index"])
+        print(f"run_batch Entrada: .txt.gz con 2 tableros → Salida: {counts}")
+        self.assertEqual(counts, {"solved": 1, "unsolvable": 1})
+        self.assertEqual([(r["index"], r["status"]) for r in records],
+                         [(0, "solved"), (1, "unsolvable")])
+
+    def test_solve_parallel(self):
+        """
+        Tablero 3x3 con un único par en esquinas opuestas: el camino debe recorrer todas
+        las celdas y solo hay dos formas (en serpiente por filas o por columnas), así que
+        el primer nivel se parte en dos subárboles. Con 2 procesos se obtiene la solución.
+        """
+        board = Board(3, 3, {1: [(0, 0), (2, 2)]})
+        subtrees = list(iter_subtrees(board, depth=1))
+        self.assertEqual(len(subtrees), 2)
+        self.assertTrue(all(len(prefix) == 1 for prefix in subtrees))
+        paths = solve_parallel(board, workers=2)
+        print(f"solve_parallel Entrada: 3x3, {len(subtrees)} subárboles → Salida: {paths}")
+        self.assertIsNotNone(paths)
+        self.assertTrue(is_game_completed(board))
+
+        board = Board(*read_board_file("exampleEZ.txt"))
+        self.assertIsNotNone(solve_parallel(board, workers=2))
+        self.assertTrue(is_game_completed(board))
+
+    def test_solve_parallel_stops_generating(self):
+        """
+        El primer subárbol (el tablero entero) tiene solución y el generador de
+        subárboles se queda bloqueado después hasta que se cancela (como mucho 10 s).
+        La solución del primer proceso debe activar la cancelación y devolverse sin
+        esperar a que termine la generación.
+        """
+        board = Board(*read_board_file("exampleEZ.txt"))
+        blocked = []
+
+        def slow_subtrees(board, depth, max_paths, cancel=None):
+            yield []
+            start = time.perf_counter()
+            while not (cancel and cancel.is_set()) and time.perf_counter() - start < 10:
+                time.sleep(0.01)
+            blocked.append(time.perf_counter() - start)
+
+        original = parallel.iter_subtrees
+        parallel.iter_subtrees = slow_subtrees
+        try:
+            paths = solve_parallel(board, workers=2)
+        finally:
+            parallel.iter_subtrees = original
+        print(f"solve_parallel Entrada: generador bloqueado → Salida: esperó {blocked[0]:.2f} s")
+        self.assertIsNotNone(paths)
+        self.assertLess(blocked[0], 5)
+
+    def test_generate_puzzle(self):
+        """
+        El generador con semilla es reproducible, su solución recorre todo el tablero y,
+        con unique=True, el motor SAT no encuentra otra. split_path no deja tramos que
+        se toquen a sí mismos. El banco de pruebas resuelve el
+        tablero y detecta como regresión un nivel que resuelve menos tableros.
+        """
+        rows, cols, pairs, solution = generate_puzzle(6, 6, seed=11)
+        self.assertEqual(generate_puzzle(6, 6, seed=11)[2], pairs)
+        cells = [cell for path in solution.values() for cell in path]
+        self.assertEqual(len(cells), 36)
+        self.assertEqual(len(set(cells)), 36)
+        board = Board(rows, cols, pairs)
+        self.assertIsNone(solve_sat(board, exclude=[solution]))
+        self.assertIsNotNone(solve(board))
+        print(f"generate_puzzle Entrada: 6x6 semilla 11 → Salida: {len(pairs)} pares, única")
+
+        # Ningún tramo del corte se toca a sí mismo, tampoco el último (que antes se
+        # unía al anterior cuando quedaba corto)
+        for seed in range(200):
+            rnd = random.Random(seed)
+            path = random_hamiltonian_path(4 + seed % 6, 4 + seed % 6, rnd)
+            segments = split_path(path, None, rnd)
+            self.assertEqual([cell for segment in segments for cell in segment], path)
+            for segment in segments:
+                self.assertGreaterEqual(len(segment), 2)
+                for i in range(2, len(segment)):
+                    self.assertFalse(any(abs(segment[i][0] - r) + abs(segment[i][1] - c) == 1
+                                         for r, c in segment[:i - 1]), (seed, segment))
+
+        suite = build_suite([6], per_tier=1, seed=1)
+        record = run_puzzle(suite[0], timeout=30)
+        self.assertEqual(record["status"], "solved")
+        summary = summarize([record])
+        self.assertEqual(compare(summary, summary), [])
+        worse = {"6": dict(summary["6"], solved=0)}
+        self.assertEqual(len(compare(worse, summary)), 1)
+
+    def test_tracer(self):
+        """
+        Con un Tracer la búsqueda da la misma solución y los histogramas por
+        profundidad suman lo mismo que los contadores de SearchStats; el informe
+        es serializable en JSON y profile_call devuelve el resultado de la llamada.
+        """
+        board = Board(*read_board_file("exampleEZ.txt"))
+        stats = SearchStats()
+        tracer = Tracer()
+        paths = solve(board, stats=stats, tracer=tracer, propagate=False)
+        self.assertEqual(paths, solve(Board(*read_board_file("exampleEZ.txt")), propagate=False))
+        report = json.loads(json.dumps(tracer.as_dict(stats)))
+        print(f"Tracer Entrada: exampleEZ.txt → Salida: {report['depth']}")
+        self.assertEqual(sum(report["depth"]["nodes"]), stats.nodes)
+        self.assertEqual(sum(report["depth"]["paths"]), stats.paths)
+        self.assertEqual(sum(report["depth"]["pruned"]), stats.pruned)
+        self.assertEqual(sum(report["depth"]["backtracks"]), stats.backtracks)
+        self.assertEqual(sum(report["pairs"].values()), stats.paths)
+        self.assertIn("enumerate", report["phases"])
+
+        result, text = profile_call(solve, Board(*read_board_file("exampleEZ.txt")), limit=5)
+        self.assertIsNotNone(result)
+        self.assertIn("solve", text)
+
+    def test_board_renderer(self):
+        """
+        BoardRenderer pinta todo la primera vez y después solo las celdas cuyo
+        camino cambia; el resultado es idéntico píxel a píxel al de un repintado
+        completo.
+        """
+        import pygame
+        pygame.font.init()
+        font = pygame.font.Font(None, FONT_SIZE)
+        board = Board(3, 3, {1: [(0, 0), (0, 2)], 2: [(2, 0), (2, 2)]})
+        size = (MARGIN * 2 + 3 * CELL_SIZE, MARGIN * 2 + 3 * CELL_SIZE)
+        screen = pygame.Surface(size)
+        renderer = BoardRenderer(board, font)
+        self.assertEqual(len(renderer.draw(screen)), 1)
+        self.assertEqual(renderer.draw(screen), [])
+
+        board.set_path(1, [(0, 0), (0, 1)])
+        self.assertEqual(len(renderer.draw(screen)), 2)
+        board.add_to_path(1, (0, 2))
+        board.set_path(2, [(2, 0), (1, 0), (1, 1), (1, 2), (2, 2)])
+        dirty = renderer.draw(screen)
+        print(f"BoardRenderer Entrada: 3x3 → Salida: {len(dirty)} celdas repintadas")
+        self.assertEqual(len(dirty), 7)  # (0,1) cambia de forma, (0,2) y las 5 del par 2
+
+        board.remove_last_from_path(2)
+        renderer.invalidate_rect(pygame.Rect(0, 0, 40, 40))  # p. ej. un texto encima
+        renderer.draw(screen)
+        fresh = pygame.Surface(size)
+        BoardRenderer(board, font).draw(fresh)
+        self.assertEqual(pygame.image.tostring(screen, "RGB"), pygame.image.tostring(fresh, "RGB"))
+
+    def test_search_runner(self):
+        """
+        SearchRunner resuelve en otro hilo. Pausado desde el principio se detiene
+        tras la primera colocación, step() avanza exactamente una más y, al
+        reanudar, termina con la misma solución que solve(). stop() cancela una
+        búsqueda en pausa. Si la búsqueda lanza una excepción, el hilo termina y
+        la deja en error.
+        """
+        board = Board(*read_board_file("exampleEZ.txt"))
+        expected = solve(Board(*read_board_file("exampleEZ.txt")), propagate=False)
+        runner = SearchRunner(board, propagate=False)
+        runner.pause()
+        runner.start()
+        deadline = time.time() + 10
+        while runner.placements < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(runner.placements, 1)
+        version, paths = runner.snapshot()
+        self.assertEqual(len(paths), 1)
+        runner.step()
+        while runner.placements < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(runner.placements, 2)
+        self.assertGreater(runner.snapshot()[0], version)
+        runner.resume()
+        while not runner.done() and time.time() < deadline:
+            time.sleep(0.01)
+        print(f"SearchRunner Entrada: exampleEZ.txt → Salida: {runner.placements} colocaciones")
+        self.assertEqual(runner.result, expected)
+        self.assertEqual(runner.snapshot()[1], expected)
+        self.assertEqual(board.paths, {})  # el tablero original no se toca
+
+        runner = SearchRunner(board)
+        runner.pause()
+        runner.start()
+        runner.stop()
+        self.assertTrue(runner.done())
+
+        runner = SearchRunner(board, analysis="nump").start()
+        runner.stop()
+        self.assertTrue(runner.done())
+        self.assertIsNone(runner.outcome)
+        self.assertIsInstance(runner.error, ValueError)
+
+    def test_solution_cache(self):
+        """
+        La huella no cambia al girar el tablero ni al renumerar los pares; una
+        solución guardada se devuelve transformada a la orientación consultada y
+        completa ese tablero. La caché persiste en disco y solve_file la usa y la
+        rellena con las soluciones nuevas. solve_cached (que usan batch y
+        SearchRunner) devuelve un SolveResult con cached=True si no ha buscado.
+        """
+        rows, cols, pairs = read_board_file("exampleEZ.txt")
+        # Giro de 90º (r, c) -> (c, rows - 1 - r) y números cambiados
+        rotated = {10 + number: [(c, rows - 1 - r) for r, c in positions]
+                   for number, positions in pairs.items()}
+        self.assertEqual(fingerprint(rows, cols, pairs), fingerprint(cols, rows, rotated))
+        self.assertNotEqual(fingerprint(rows, cols, pairs), fingerprint(*read_board_file("example.txt")))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            with SolutionCache(path) as cache:
+                board = Board(rows, cols, pairs)
+                self.assertIsNone(cache.get(board))
+                cache.put(board, solve(board))
+            with SolutionCache(path) as cache:
+                board = Board(cols, rows, rotated)
+                paths = cache.get(board)
+                print(f"SolutionCache Entrada: exampleEZ girado → Salida: {sorted(paths)}")
+                board.set_paths(paths)
+                self.assertTrue(is_game_completed(board))
+                self.assertEqual(len(cache), 1)
+            record, = solve_file("exampleEZ.txt", cache=path)
+            self.assertEqual((record["status"], record.get("cached")), ("solved", True))
+
+            # Con la caché vacía, solve_file resuelve (motor por defecto) y guarda
+            cold = os.path.join(tmp, "cold.sqlite")
+            record, = solve_file("exampleEZ.txt", cache=cold)
+            self.assertEqual((record["status"], record.get("cached")), ("solved", None))
+            with SolutionCache(cold) as cache:
+                self.assertEqual(len(cache), 1)
+            record, = solve_file("exampleEZ.txt", cache=cold)
+            self.assertEqual((record["status"], record.get("cached")), ("solved", True))
+
+        # solve_cached resuelve y guarda la primera vez; después la solución sale de
+        # la caché, también en el hilo de SearchRunner
+        with SolutionCache(":memory:") as cache:
+            board = Board(rows, cols, pairs)
+            result = solve_cached(board, cache)
+            self.assertEqual((result.status, result.cached), ("solved", False))
+            self.assertEqual(len(cache), 1)
+            runner = SearchRunner(Board(cols, rows, rotated), cache=cache).start()
+            runner.stop()
+            self.assertIsNone(runner.error)
+            self.assertEqual((runner.outcome.status, runner.outcome.cached), ("solved", True))
+            board = Board(cols, rows, rotated)
+            board.set_paths(runner.result)
+            self.assertTrue(is_game_completed(board))
+
+    def test_iter_boards_and_pack(self):
+        """
+        iter_boards lee varios tableros de un mismo archivo (también .gz) y rechaza
+        extremos repetidos, coordenadas fuera del tablero y números sin pareja.
+        PuzzlePack devuelve cualquier tablero por índice tras empaquetarlos.
+        """
+        first = read_board_file("example.txt")
+        second = read_board_file("exampleEZ.txt")
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = os.path.join(tmp, "corpus.txt.gz")
+            with gzip.open(corpus, "wt") as output:
+                output.write("# dos tableros\n" + format_board(*first) + "\n" + format_board(*second))
+            boards = list(iter_boards(corpus))
+            self.assertEqual(boards, [first, second])
+
+            for text, error in [("2,2\n1,1,1\n1,1,2\n", "repetida"),
+                                ("2,2\n1,1,1\n3,1,1\n", "fuera"),
+                                ("2,2\n1,1,1\n2,2,1\n1,2,2\n", "extremo")]:
+                with self.assertRaisesRegex(BoardFormatError, error):
+                    list(iter_boards(io.StringIO(text)))
+
+            packed = os.path.join(tmp, "corpus.nlp")
+            self.assertEqual(write_pack(packed, boards * 3), 6)
+            with PuzzlePack(packed) as pack:
+                print(f"PuzzlePack Entrada: 6 tableros → Salida: {len(pack)} tableros")
+                self.assertEqual(len(pack), 6)
+                self.assertEqual(pack[3], second)
+                self.assertEqual(pack[-2], first)
+                self.assertEqual(list(pack), boards * 3)
+                with self.assertRaises(IndexError):
+                    pack[6]
+
     # NOTA: Las otras funciones de main.py dependen de Pygame en tiempo real
     # (show_menu, run_manual_game, run_solver2, main), por lo que no las probamos aquí
     # con pruebas unitarias estrictas. Dejaríamos su testeo para un entorno de integración.
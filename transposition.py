@@ -0,0 +1,56 @@
+# transposition.py
+#
+# Tabla de transposición para la búsqueda: recuerda estados parciales ya
+# explorados (celdas ocupadas + pares pendientes) para no repetir subárboles
+# cuando se llega al mismo estado por otro orden de colocaciones.
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    Diccionario acotado con expulsión LRU. Las claves son cualquier valor
+    hashable; Search.state_key usa la tupla (máscara de celdas ocupadas, pares
+    pendientes con sus cabezas ordenados). Los valores son lo que la búsqueda
+    quiera recordar de ese estado.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries  # 0 desactiva la tabla
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        # Devuelve el valor guardado (y lo marca como reciente) o None
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def store(self, key, value=True):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def as_dict(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
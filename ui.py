@@ -1,6 +1,8 @@
 # ui.py
-
-import pygame
+#
+# pygame se importa dentro de cada función: las constantes de este módulo se
+# pueden usar (p. ej. desde main.get_cell_from_mouse o las pruebas) sin
+# cargar pygame ni SDL.
 
 CELL_SIZE = 60
 MARGIN = 20
@@ -20,31 +22,122 @@ COLOR_MAP = [
     (255, 255, 0),    # Amarillo
 ]
 
-def draw_board(screen, board, font):
-    screen.fill((255, 255, 255))  # Blanco de fondo
-
-    for r in range(board.rows):
-        for c in range(board.cols):
-            rect = pygame.Rect(
-                MARGIN + c * CELL_SIZE,
-                MARGIN + r * CELL_SIZE,
-                CELL_SIZE,
-                CELL_SIZE
-            )
-            pygame.draw.rect(screen, (0, 0, 0), rect, 2)  # Borde de celda
-
-            value = board.grid[r][c]
-            if value is not None:
-                text = font.render(str(value), True, (0, 0, 0))
-                text_rect = text.get_rect(center=rect.center)
-                screen.blit(text, text_rect)
-
-    for num, path in board.paths.items():
-        if len(path) > 1:
+# Dirección (fila, columna) de cada vecino, para los tramos de línea de una celda
+_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class BoardRenderer:
+    """
+    Dibujo incremental del tablero. La cuadrícula y los números se pintan una
+    sola vez en una superficie de fondo; cada celda recuerda qué tramos de línea
+    (color y direcciones hacia sus vecinos del camino) tiene dibujados, y draw()
+    solo repinta las celdas que han cambiado. Devuelve los rectángulos tocados
+    para pasárselos a pygame.display.update.
+    """
+
+    def __init__(self, board, font):
+        import pygame
+
+        self.board = board
+        width = MARGIN * 2 + board.cols * CELL_SIZE
+        height = MARGIN * 2 + board.rows * CELL_SIZE
+        self.background = pygame.Surface((width, height))
+        self.background.fill((255, 255, 255))
+        # Un glifo por número, renderizado una sola vez
+        self.glyphs = {number: font.render(str(number), True, (0, 0, 0))
+                       for number in board.pairs}
+        self.rects = {}
+        for r in range(board.rows):
+            for c in range(board.cols):
+                rect = pygame.Rect(MARGIN + c * CELL_SIZE, MARGIN + r * CELL_SIZE,
+                                   CELL_SIZE, CELL_SIZE)
+                self.rects[(r, c)] = rect
+                pygame.draw.rect(self.background, (0, 0, 0), rect, 2)
+                value = board.grid[r][c]
+                if value is not None:
+                    glyph = self.glyphs[value]
+                    self.background.blit(glyph, glyph.get_rect(center=rect.center))
+        self._drawn = {}  # celda -> (color, direcciones) ya pintado en pantalla
+        self._full = True  # el próximo draw() repinta todo
+        self._damaged = []  # zonas a restaurar desde el fondo (p. ej. textos encima)
+
+    def invalidate_rect(self, rect):
+        # Restaura 'rect' desde el fondo en el próximo draw(), con las celdas que toque
+        import pygame
+
+        self._damaged.append(pygame.Rect(rect))
+
+    def cell_states(self):
+        # Lo que debe verse en cada celda con caminos: (color, direcciones)
+        states = {}
+        for num, path in self.board.paths.items():
+            if len(path) < 2:
+                continue
             color = COLOR_MAP[(num - 1) % len(COLOR_MAP)]
-            points = [
-                (MARGIN + c * CELL_SIZE + CELL_SIZE // 2,
-                 MARGIN + r * CELL_SIZE + CELL_SIZE // 2)
-                for r, c in path
-            ]
-            pygame.draw.lines(screen, color, False, points, LINE_WIDTH)
+            for a, b in zip(path, path[1:]):
+                dr, dc = b[0] - a[0], b[1] - a[1]
+                states.setdefault(a, (color, set()))[1].add((dr, dc))
+                states.setdefault(b, (color, set()))[1].add((-dr, -dc))
+        return {cell: (color, frozenset(dirs)) for cell, (color, dirs) in states.items()}
+
+    def _paint(self, screen, cell, state):
+        import pygame
+
+        rect = self.rects[cell]
+        screen.blit(self.background, rect, rect)
+        if state is None:
+            return
+        color, dirs = state
+        cx, cy = rect.center
+        clip = screen.get_clip()
+        screen.set_clip(rect)
+        for dr, dc in dirs:
+            end = (cx + dc * CELL_SIZE // 2, cy + dr * CELL_SIZE // 2)
+            pygame.draw.line(screen, color, (cx, cy), end, LINE_WIDTH)
+        # Rellena la esquina donde se unen dos tramos
+        half = LINE_WIDTH // 2
+        pygame.draw.rect(screen, color, (cx - half, cy - half, LINE_WIDTH, LINE_WIDTH))
+        screen.set_clip(clip)
+
+    def _cells_in(self, rect):
+        board = self.board
+        first_row = max(0, (rect.top - MARGIN) // CELL_SIZE)
+        last_row = min(board.rows - 1, (rect.bottom - 1 - MARGIN) // CELL_SIZE)
+        first_col = max(0, (rect.left - MARGIN) // CELL_SIZE)
+        last_col = min(board.cols - 1, (rect.right - 1 - MARGIN) // CELL_SIZE)
+        return [(r, c) for r in range(first_row, last_row + 1)
+                for c in range(first_col, last_col + 1)]
+
+    def draw(self, screen):
+        """
+        Pone la pantalla al día con board.paths y devuelve la lista de
+        rectángulos modificados (vacía si no ha cambiado nada).
+        """
+        states = self.cell_states()
+        if self._full:
+            self._full = False
+            self._damaged.clear()
+            screen.blit(self.background, (0, 0))
+            for cell, state in states.items():
+                self._paint(screen, cell, state)
+            self._drawn = states
+            return [self.background.get_rect()]
+
+        dirty = []
+        forced = set()
+        for rect in self._damaged:
+            screen.blit(self.background, rect, rect)
+            forced.update(self._cells_in(rect))
+            dirty.append(rect)
+        self._damaged.clear()
+
+        drawn = self._drawn
+        changed = {cell for cell in drawn.keys() | states.keys()
+                   if drawn.get(cell) != states.get(cell)}
+        for cell in changed | forced:
+            state = states.get(cell)
+            self._paint(screen, cell, state)
+            if cell in changed:
+                dirty.append(self.rects[cell])
+        self._drawn = states
+        return dirty